@@ -3,35 +3,112 @@ from flask_cors import CORS
 import cv2
 import threading
 import time
-import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 import logging
 import sys
 import re
 import socket
-import errno
+import contextlib
 import numpy as np
-from dotenv import load_dotenv
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from dotenv import load_dotenv, dotenv_values
 from services.camera_service import CameraService
 from services.ai_service import AIService
 from services.mqtt_service import get_mqtt_instance, MQTTService
 from services.detection_service import DetectionService
 from services.ha_service import HAService
+from services.image_encoder import encode_jpeg
+
+# Sérialisation JSON rapide (orjson) pour les endpoints interrogés en boucle, si disponible
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Encodage base64 SIMD (pybase64, même API que base64) si disponible
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 #TEST Introduction classe
 class CameraContext:
+    __slots__ = (
+        'camera_id', 'current_frame', 'frame_seq', 'current_jpeg', 'current_part', 'jpeg_seq', 'encode_lock',
+        'is_capturing',
+        'analysis_in_progress', 'last_analysis_time', 'last_analysis_duration',
+        'last_analysis_total_interval', 'ai_consecutive_failures', 'lock', 'cond',
+        'frame_ring', 'resize_buf', 'last_analysis_mono', 'published_capture_active'
+    )
+
     def __init__(self, camera_id):
         self.camera_id = camera_id
         self.current_frame = None
+        self.frame_seq = 0  # Incrémenté à chaque frame publiée
+        # JPEG encodé à la demande, au plus une fois par frame (partagé par tous les clients du flux):
+        # aucun encodage tant que personne ne regarde la caméra
+        self.current_jpeg = None
+        # Partie multipart MJPEG complète (en-tête + JPEG + fin), construite avec le JPEG
+        self.current_part = None
+        self.jpeg_seq = 0  # frame_seq de la frame encodée dans current_jpeg
+        self.encode_lock = threading.Lock()
+        # Verrou propre à la caméra (pas de contention entre caméras)
+        self.lock = threading.RLock()
+        self.cond = threading.Condition(self.lock)
+        # Tampon borné entre le thread de décodage et la boucle de traitement (la plus récente gagne)
+        self.frame_ring = deque(maxlen=2)
         self.is_capturing = False
         self.analysis_in_progress = False
         self.last_analysis_time = 0
+        # Fin de la dernière analyse en perf_counter (horloge monotone, insensible aux sauts NTP)
+        self.last_analysis_mono = float('-inf')
         self.last_analysis_duration = 0
         self.last_analysis_total_interval = 0
         self.ai_consecutive_failures = 0
+        # Tampon 720p réutilisé par resize_frame_for_analysis (une seule analyse en cours par caméra),
+        # alloué à la première frame à redimensionner: rien pour les caméras jamais analysées ou déjà en 720p
+        self.resize_buf = None
+        # Dernier état capture_active publié sur MQTT (None = jamais publié)
+        self.published_capture_active = None
+
+    def stop(self):
+        """Marque la capture comme arrêtée et réveille immédiatement les flux en attente"""
+        with self.cond:
+            self.is_capturing = False
+            self.cond.notify_all()
 
 camera_contexts = {}
+# Protège uniquement les insertions/suppressions dans camera_contexts
+_contexts_lock = threading.Lock()
+
+def _get_or_create_context(camera_id):
+    """Retourne le contexte de la caméra, en le créant si nécessaire (True si créé)"""
+    with _contexts_lock:
+        ctx = camera_contexts.get(camera_id)
+        if ctx is not None:
+            return ctx, False
+        ctx = CameraContext(camera_id)
+        camera_contexts[camera_id] = ctx
+        return ctx, True
+
+def _contexts_snapshot():
+    """Copie (camera_id, ctx) des contextes pour itération sans verrou"""
+    with _contexts_lock:
+        return list(camera_contexts.items())
+
+def _publish_capture_active(ctx, active: bool):
+    """Publie l'état capture_active de la caméra sur MQTT uniquement lors d'un changement d'état"""
+    if ctx.published_capture_active == active:
+        return
+    try:
+        if mqtt_service.publish_binary_sensor_state(f'capture_active_{ctx.camera_id}', active):
+            ctx.published_capture_active = active
+    except Exception:
+        pass
 
 
 
@@ -47,6 +124,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(os.getenv(key, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """Configuration lue une seule fois depuis l'environnement (rechargée via /api/admin/reload)"""
+    rtsp_url: str
+    capture_mode: str
+    ha_base_url: str
+    ha_token: str
+    ha_entity_id: str
+    ha_image_attr: str
+    ha_poll_interval: float
+    min_analysis_interval: float
+    ai_timeout: float
+    jpeg_quality: int
+
+    @classmethod
+    def from_env(cls) -> 'AppConfig':
+        return cls(
+            rtsp_url=os.getenv('DEFAULT_RTSP_URL', ''),
+            capture_mode=os.getenv('CAPTURE_MODE', 'rtsp'),
+            ha_base_url=os.getenv('HA_BASE_URL', '').rstrip('/'),
+            ha_token=os.getenv('HA_TOKEN', ''),
+            ha_entity_id=os.getenv('HA_ENTITY_ID', ''),
+            ha_image_attr=os.getenv('HA_IMAGE_ATTR', 'entity_picture'),
+            ha_poll_interval=_env_float('HA_POLL_INTERVAL', 1.0),
+            min_analysis_interval=_env_float('MIN_ANALYSIS_INTERVAL', 0.1),
+            ai_timeout=_env_float('AI_TIMEOUT', 10.0),
+            jpeg_quality=int(_env_float('JPEG_QUALITY', 80)),
+        )
+
+    def public_dict(self) -> dict:
+        """Sous-ensemble exposé au frontend (sans secrets)"""
+        data = asdict(self)
+        for key in ('ha_token', 'min_analysis_interval', 'ai_timeout', 'jpeg_quality'):
+            data.pop(key, None)
+        return data
+
+CFG = AppConfig.from_env()
+_public_config = CFG.public_dict()
+
+def reload_app_config():
+    """Recharge CFG depuis l'environnement courant"""
+    global CFG, _public_config
+    CFG = AppConfig.from_env()
+    _public_config = CFG.public_dict()
+    return CFG
+
+# Clés dont les espaces ne doivent pas être convertis (URLs, tokens, mots de passe)
+_ENV_EXEMPT_KEYS = frozenset({
+    'DEFAULT_RTSP_URL', 'LMSTUDIO_URL', 'OLLAMA_URL', 'OPENAI_API_KEY',
+    'MQTT_PASSWORD', 'RTSP_PASSWORD', 'HA_TOKEN', 'HA_BASE_URL'
+})
+_WHITESPACE_RE = re.compile(r"\s+")
+
+@lru_cache(maxsize=256)
+def _sanitize_env_str(v: str, key: str) -> str:
+    """Normalisation pure (mise en cache) d'une valeur texte pour une clé donnée"""
+    v = v.strip()
+    # Remove surrounding quotes if present
+    if (v.startswith('"') and v.endswith('"')) or (v.startswith("'") and v.endswith("'")):
+        v = v[1:-1]
+
+    if key not in _ENV_EXEMPT_KEYS:
+        # Collapse any whitespace (spaces, tabs) into single underscores
+        v = _WHITESPACE_RE.sub("_", v)
+
+    return v
+
 def _sanitize_env_value(value, key: str) -> str:
     """Normalize values written to .env to avoid spaces breaking Docker env parsing.
     - Trim whitespace
@@ -58,25 +208,31 @@ def _sanitize_env_value(value, key: str) -> str:
     try:
         if value is None:
             return ''
-        v = str(value).strip()
-        # Remove surrounding quotes if present
-        if (v.startswith('"') and v.endswith('"')) or (v.startswith("'") and v.endswith("'")):
-            v = v[1:-1]
-
-        # Keys that should not have their spaces converted
-        exempt_keys = {
-            'DEFAULT_RTSP_URL', 'LMSTUDIO_URL', 'OLLAMA_URL', 'OPENAI_API_KEY',
-            'MQTT_PASSWORD', 'RTSP_PASSWORD', 'HA_TOKEN', 'HA_BASE_URL'
-        }
-
-        if key not in exempt_keys:
-            # Collapse any whitespace (spaces, tabs) into single underscores
-            v = re.sub(r"\s+", "_", v)
-
-        return v
+        return _sanitize_env_str(str(value), key)
     except Exception:
         return '' if value is None else str(value)
 
+# Contenu du .env écrit par /api/admin/config: (en-tête de section, [(clé, valeur par défaut)])
+_ENV_SCHEMA = (
+    ("# Configuration IA", [('AI_API_MODE', 'lmstudio'), ('AI_TIMEOUT', '10')]),
+    ("# Configuration Logs", [('LOG_LEVEL', 'INFO')]),
+    ("# Configuration OpenAI", [('OPENAI_API_KEY', ''), ('OPENAI_MODEL', 'gpt-4-vision-preview')]),
+    ("# Configuration LM Studio", [('LMSTUDIO_URL', 'http://127.0.0.1:11434/v1'), ('LMSTUDIO_MODEL', '')]),
+    ("# Configuration Ollama", [('OLLAMA_URL', 'http://127.0.0.1:11434/v1'), ('OLLAMA_MODEL', '')]),
+    ("# Configuration MQTT", [
+        ('MQTT_BROKER', '127.0.0.1'), ('MQTT_PORT', '1883'), ('MQTT_USERNAME', ''), ('MQTT_PASSWORD', '')
+    ]),
+    ("# Configuration Home Assistant", [('HA_DEVICE_NAME', 'IAction'), ('HA_DEVICE_ID', 'iaction_camera')]),
+    ("# Configuration Caméra", [
+        ('CAPTURE_MODE', 'rtsp'), ('DEFAULT_RTSP_URL', ''), ('RTSP_USERNAME', ''), ('RTSP_PASSWORD', '')
+    ]),
+    ("# Configuration HA Polling", [
+        ('HA_BASE_URL', ''), ('HA_TOKEN', ''), ('HA_ENTITY_ID', ''),
+        ('HA_IMAGE_ATTR', 'entity_picture'), ('HA_POLL_INTERVAL', '1.0')
+    ]),
+    ("# Configuration Analyse", [('MIN_ANALYSIS_INTERVAL', '0.1')]),
+)
+
 def is_running_in_docker() -> bool:
     """Detect if we're running inside a Docker container.
     Checks /.dockerenv presence or IN_DOCKER env var.
@@ -88,79 +244,70 @@ def is_running_in_docker() -> bool:
     except Exception:
         return False
 
-def _wait_until_bind_possible(host: str, port: int, timeout: float = 10.0) -> bool:
-    """Attend jusqu'à ce qu'un bind(host, port) soit possible (port vraiment libéré)."""
-    t0 = time.time()
-    while time.time() - t0 < timeout:
+def _create_listen_socket(host: str, port: int) -> socket.socket:
+    """Crée le socket d'écoute HTTP.
+    - POSIX: SO_REUSEADDR (rebind immédiat malgré les connexions en TIME_WAIT); pas de SO_REUSEPORT,
+      qui laisserait un second lancement accidentel partager le port au lieu d'échouer (EADDRINUSE)
+    - Windows: SO_EXCLUSIVEADDRUSE (SO_REUSEADDR y autoriserait un détournement du port)
+    Seul le processus relancé par _delayed_self_restart (IACTION_RESTART_CHILD=1) réessaie le bind avec un
+    backoff court (20ms, x2, plafonné à 0.5s, 10s max) le temps que le parent libère le port.
+    """
+    exclusive = os.name == 'nt' and hasattr(socket, 'SO_EXCLUSIVEADDRUSE')
+    retry = os.environ.get('IACTION_RESTART_CHILD') == '1'
+    delay = 0.02
+    deadline = time.monotonic() + 10.0
+    while True:
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if exclusive:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            else:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             s.bind((host, port))
+            s.listen(128)
+            return s
+        except OSError:
             s.close()
-            return True
+            if not retry or time.monotonic() + delay > deadline:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
         except Exception:
-            try:
-                s.close()
-            except Exception:
-                pass
-            time.sleep(0.2)
-    return False
-
-def _run_web_server_with_retry(host: str = '0.0.0.0', port: int = 5002, debug: bool = False, max_attempts: int = 8):
-    """Lance Flask avec une stratégie de retry robuste si le port est encore occupé.
-    - Pré-vérifie la disponibilité du port par un bind test.
-    - Retrie en cas d'OSError (EADDRINUSE) et de SystemExit issus de werkzeug.
-    """
-    delay = 0.4
-    attempt = 1
-    while attempt <= max_attempts:
-        mode = 'DEBUG' if debug else 'PRODUCTION'
-        if attempt > 1:
-            logger.info(f"Nouvelle tentative de démarrage du serveur (essai {attempt}/{max_attempts}) en mode {mode}...")
-
-        # Pré-bind: vérifier que le port est libre
-        prebind_ok = False
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.bind((host, port))
             s.close()
-            prebind_ok = True
-        except OSError as e:
-            if getattr(e, 'errno', None) in (errno.EADDRINUSE, 10048):
-                if attempt < max_attempts:
-                    logger.warning(f"Port {port} occupé (pré-vérification), attente {delay:.1f}s avant retry...")
-                    time.sleep(delay)
-                    delay = min(2.0, delay * 1.6)
-                    attempt += 1
-                    continue
-            # Autre erreur, on tente quand même app.run pour obtenir un message clair
-        except Exception:
-            # On ne bloque pas sur la pré-vérif
-            pass
+            raise
 
+def _create_web_server(host: str = '0.0.0.0', port: int = 5002, debug: bool = False):
+    """Crée le serveur web sur un socket d'écoute créé explicitement (voir _create_listen_socket).
+    - Hors debug: waitress (serveur WSGI de production, keep-alive) si disponible
+    - Sinon: serveur werkzeug sur le même socket (débogueur interactif en debug, sans rechargement automatique)
+    Retourne (run, stop): run() bloque en servant les requêtes, stop() l'interrompt depuis un autre thread.
+    """
+    sock = _create_listen_socket(host, port)
+    if not debug:
         try:
-            app.run(debug=debug, host=host, port=port, threaded=True, use_reloader=False)
-            return
-        except OSError as e:
-            msg = str(e).lower()
-            addr_in_use = (getattr(e, 'errno', None) in (errno.EADDRINUSE, 10048)) or ('address already in use' in msg or ('port' in msg and 'in use' in msg))
-            if addr_in_use and attempt < max_attempts:
-                logger.warning(f"Port {port} occupé, attente {delay:.1f}s avant retry...")
-                time.sleep(delay)
-                delay = min(2.0, delay * 1.6)
-                attempt += 1
-                continue
-            raise
-        except SystemExit as e:
-            # Certains chemins de werkzeug lèvent SystemExit quand le bind échoue
-            if attempt < max_attempts:
-                logger.warning(f"Échec de démarrage du serveur (SystemExit). Attente {delay:.1f}s avant retry...")
-                time.sleep(delay)
-                delay = min(2.0, delay * 1.6)
-                attempt += 1
-                continue
-            raise
+            from waitress.server import create_server
+        except ImportError:
+            create_server = None
+        if create_server is not None:
+            raw_threads = os.getenv('WEB_THREADS', '32')
+            try:
+                threads = max(1, int(raw_threads))
+            except ValueError:
+                logger.warning(f"WEB_THREADS invalide ({raw_threads!r}): valeur 32 utilisée")
+                threads = 32
+            server = create_server(app, sockets=[sock], threads=threads)
+            logger.info(f"Serveur WSGI waitress sur {host}:{port} ({threads} threads)")
+            return server.run, server.close
+    from werkzeug.serving import make_server
+    app.debug = debug
+    wsgi_app = app
+    if debug:
+        # Débogueur interactif de werkzeug (ce que app.run(debug=True) ajoutait): traceback dans le navigateur
+        from werkzeug.debug import DebuggedApplication
+        wsgi_app = DebuggedApplication(app, evalex=True)
+    server = make_server(host, port, wsgi_app, threaded=True, fd=sock.fileno())
+    logger.info(f"Serveur werkzeug sur {host}:{port}")
+    return server.serve_forever, server.shutdown
 
 def _build_restart_args() -> list:
     """Build clean argv for re-exec: keep current flags but force no reloader."""
@@ -171,44 +318,21 @@ def _build_restart_args() -> list:
     except Exception:
         return [sys.executable, sys.argv[0], '--no-reloader']
 
-def _wait_for_port_to_close(host: str, port: int, timeout: float = 10.0) -> bool:
-    """Return True when TCP connect fails (port closed) or timeout reached.
-    Polls the given host:port until connection is refused, meaning the previous
-    server has released the port.
-    """
-    t0 = time.time()
-    while time.time() - t0 < timeout:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            s.settimeout(0.3)
-            s.connect((host, port))
-            # Connection succeeded -> server still up
-            s.close()
-            time.sleep(0.2)
-        except Exception:
-            try:
-                s.close()
-            except Exception:
-                pass
-            return True
-    return False
-
 def _delayed_self_restart(delay_sec: float = 0.3, shutdown_fn=None):
     """Redémarrage robuste par sous-processus (tous environnements).
-    - Crée un sous-processus Python (avec IACTION_WAIT_FOR_PID)
+    - Crée un sous-processus Python
     - Arrête proprement le serveur actuel, cleanup, puis quitte le parent
-    - Le sous-processus attend que le port soit libéré avant de démarrer
+    - Le sous-processus réessaie le bind jusqu'à ce que le port soit libéré
     """
     try:
         time.sleep(delay_sec)
         args = _build_restart_args()
         # Créer un sous-processus, arrêter proprement, puis quitter
         try:
-            env = os.environ.copy()
-            env['IACTION_WAIT_FOR_PID'] = str(os.getpid())
             logger.info(f"🔁 Redémarrage via nouveau subprocess: {args}")
             import subprocess
-            subprocess.Popen(args, close_fds=True, env=env)
+            # Le sous-processus attend que ce processus libère le port (voir _create_listen_socket)
+            subprocess.Popen(args, close_fds=True, env={**os.environ, 'IACTION_RESTART_CHILD': '1'})
         except Exception as e:
             logger.error(f"Échec du lancement du processus enfant: {e}")
         finally:
@@ -231,16 +355,59 @@ def _delayed_self_restart(delay_sec: float = 0.3, shutdown_fn=None):
             pass
         os._exit(0)
 
-def resize_frame_for_analysis(frame):
-    """Redimensionne une frame en 720p pour l'analyse IA de manière centralisée"""
+# En-têtes de partie multipart MJPEG précalculés (immutables)
+MJPEG_PART_PREFIX = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_SUFFIX = b'\r\n'
+
+def publish_frame(ctx, frame):
+    """Publie une nouvelle frame et réveille les consommateurs du flux (l'encodage JPEG est fait à la lecture)"""
+    with ctx.cond:
+        ctx.current_frame = frame
+        ctx.frame_seq += 1
+        ctx.cond.notify_all()
+
+def get_encoded_frame(ctx):
+    """(jpeg, partie MJPEG, frame_seq) de la frame courante, encodée au premier lecteur puis partagée.
+    Retourne (None, None, 0) si aucune frame n'a pu être encodée.
+    """
+    with ctx.encode_lock:
+        with ctx.cond:
+            frame = ctx.current_frame
+            seq = ctx.frame_seq
+        if frame is not None and seq != ctx.jpeg_seq:
+            try:
+                jpeg = encode_jpeg(frame, quality=85)
+            except Exception as e:
+                logger.warning(f"[{ctx.camera_id}] Erreur d'encodage de l'image: {e}")
+                jpeg = None
+            if jpeg is None:
+                logger.error(f"[{ctx.camera_id}] Erreur d'encodage de l'image")
+            else:
+                # Une seule concaténation par frame (et non par client): chaque client fait ensuite un seul write
+                ctx.current_part = b''.join((MJPEG_PART_PREFIX, jpeg, MJPEG_PART_SUFFIX))
+                ctx.current_jpeg = jpeg
+                ctx.jpeg_seq = seq
+        return ctx.current_jpeg, ctx.current_part, ctx.jpeg_seq
+
+def resize_frame_for_analysis(frame, dst=None):
+    """Redimensionne une frame en 720p pour l'analyse IA de manière centralisée.
+    Si dst (tableau 720x1280x3) est fourni, le résultat y est écrit sans nouvelle allocation.
+    """
     try:
         if frame is None:
             return None
         # Vérifier si déjà en 720p pour éviter un redimensionnement inutile
-        height, width = frame.shape[:2]
-        if height == 720 and width == 1280:
+        shape = frame.shape
+        if shape[0] == 720 and shape[1] == 1280:
             return frame
-        return cv2.resize(frame, (1280, 720), interpolation=cv2.INTER_AREA)
+        # Forte réduction (>=2x, ex: 4K): INTER_AREA (chemin entier SIMD), sinon interpolation linéaire
+        if shape[0] >= 1440 and shape[1] >= 2560:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR
+        if dst is not None and dst.dtype == frame.dtype and frame.ndim == 3 and dst.shape[2] == shape[2]:
+            return cv2.resize(frame, (1280, 720), dst=dst, interpolation=interpolation)
+        return cv2.resize(frame, (1280, 720), interpolation=interpolation)
     except Exception as e:
         logger.warning(f"Erreur lors du redimensionnement: {e}")
         return frame
@@ -248,6 +415,20 @@ def resize_frame_for_analysis(frame):
 app = Flask(__name__)
 CORS(app)
 
+def _fast_json(obj):
+    """Réponse JSON via orjson (C/Rust) pour les endpoints chauds, fallback jsonify"""
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+# Pool borné de threads pour les analyses IA (évite la création d'un thread par analyse)
+# Taille réglable via ANALYSIS_WORKERS; une seule analyse par caméra reste garantie par ctx.analysis_in_progress
+try:
+    _analysis_workers = max(1, int(os.getenv('ANALYSIS_WORKERS', '4')))
+except ValueError:
+    _analysis_workers = 4
+_analysis_pool = ThreadPoolExecutor(max_workers=_analysis_workers, thread_name_prefix='analysis')
+
 # Services globaux
 camera_service = CameraService()
 ai_service = AIService()
@@ -271,15 +452,7 @@ def index():
 @app.route('/api/config')
 def get_config():
     """Expose la configuration nécessaire au frontend"""
-    config = {
-        'rtsp_url': os.getenv('DEFAULT_RTSP_URL', ''),
-        'capture_mode': os.getenv('CAPTURE_MODE', 'rtsp'),
-        'ha_base_url': os.getenv('HA_BASE_URL', ''),
-        'ha_entity_id': os.getenv('HA_ENTITY_ID', ''),
-        'ha_image_attr': os.getenv('HA_IMAGE_ATTR', 'entity_picture'),
-        'ha_poll_interval': float(os.getenv('HA_POLL_INTERVAL', '1.0')),
-    }
-    return jsonify(config)
+    return jsonify(_public_config)
 
 @app.route('/api/cameras')
 def get_cameras():
@@ -319,9 +492,8 @@ def get_cameras():
 def refresh_cameras():
     """Force la mise à jour de la liste des caméras"""
     try:
-        # Effacer le cache
-        camera_service.cameras_cache = None
-        camera_service.cache_time = 0
+        # Effacer le cache et relancer les tests RTSP (sans attendre l'expiration de leur TTL)
+        camera_service.invalidate_cameras_cache(reprobe=True)
         
         # Recharger les caméras
         cameras = camera_service.get_available_cameras()
@@ -382,21 +554,25 @@ def get_status():
         last_status_log_time = current_time
     
     # Collecter le statut de toutes les caméras
+    # Un seul passage: statut par caméra + compteur des caméras actives
     cameras_status = {}
-    for camera_id, ctx in camera_contexts.items():
+    active = 0
+    for camera_id, ctx in _contexts_snapshot():
+        capturing = ctx.is_capturing
+        active += capturing
         cameras_status[camera_id] = {
             'last_analysis_time': ctx.last_analysis_time,
             'last_analysis_duration': ctx.last_analysis_duration,
             'analysis_in_progress': ctx.analysis_in_progress,
-            'is_capturing': ctx.is_capturing
+            'is_capturing': capturing
         }
     
     status = {
         'cameras': cameras_status,
-        'active_cameras': len([ctx for ctx in camera_contexts.values() if ctx.is_capturing])
+        'active_cameras': active
     }
     
-    return jsonify(status)
+    return _fast_json(status)
 
 @app.route('/api/metrics')
 def get_metrics():
@@ -407,12 +583,13 @@ def get_metrics():
     analysis_fps = (1.0 / last_analysis_duration) if last_analysis_duration and last_analysis_duration > 0 else 0
     total_fps = (1.0 / last_analysis_total_interval) if last_analysis_total_interval and last_analysis_total_interval > 0 else 0
 
-    return jsonify({
+    return _fast_json({
         'last_analysis_time': last_analysis_time,
         'last_analysis_duration': last_analysis_duration,
         'analysis_fps': analysis_fps,
         'analysis_total_interval': last_analysis_total_interval,
         'analysis_total_fps': total_fps,
+        'capture_stats': camera_service.get_stats(),
         'timestamp': time.time()
     })
 
@@ -420,15 +597,19 @@ def get_metrics():
 def get_capture_status():
     """Retourne l'état actuel de la capture pour toutes les caméras"""
     cameras_capture_status = {}
-    for camera_id, ctx in camera_contexts.items():
+    active = 0
+    active_ids = camera_service.active_camera_ids()
+    for camera_id, ctx in _contexts_snapshot():
+        capturing = ctx.is_capturing
+        active += capturing
         cameras_capture_status[camera_id] = {
-            'is_capturing': ctx.is_capturing,
-            'camera_active': camera_id in camera_service.captures
+            'is_capturing': capturing,
+            'camera_active': camera_id in active_ids
         }
     
-    return jsonify({
+    return _fast_json({
         'cameras': cameras_capture_status,
-        'active_cameras': len([ctx for ctx in camera_contexts.values() if ctx.is_capturing])
+        'active_cameras': active
     })
 
 #Modification multi-cam
@@ -436,10 +617,10 @@ def get_capture_status():
 def start_capture():
     """Démarre la capture vidéo pour une caméra donnée (multi-caméra)"""
     try:
-        data = request.json or {}
+        data = request.get_json(silent=True) or {}
 
         camera_id = data.get('source')
-        source_type = data.get('type') or os.getenv('CAPTURE_MODE', 'rtsp')
+        source_type = data.get('type') or CFG.capture_mode
         rtsp_url = data.get('rtsp_url')
 
         if not camera_id:
@@ -451,13 +632,11 @@ def start_capture():
         logger.info(f"[{camera_id}] Démarrage capture - type={source_type}, rtsp={rtsp_url}")
 
         # Créer le contexte caméra si inexistant
-        if camera_id not in camera_contexts:
-            camera_contexts[camera_id] = CameraContext(camera_id)
+        ctx, created = _get_or_create_context(camera_id)
+        if created:
             # Enregistrer la caméra avec le service de détection
             detection_service.register_camera(camera_id)
 
-        ctx = camera_contexts[camera_id]
-
         if ctx.is_capturing:
             return jsonify({
                 'success': False,
@@ -472,7 +651,7 @@ def start_capture():
             actual_rtsp_url = rtsp_url
             if not actual_rtsp_url:
                 # Essayer l'URL par défaut depuis l'environnement
-                actual_rtsp_url = os.getenv('DEFAULT_RTSP_URL', '')
+                actual_rtsp_url = CFG.rtsp_url
                 if not actual_rtsp_url:
                     # Si camera_id commence par "rtsp_", c'est peut-être une caméra préconfigurée
                     if camera_id.startswith('rtsp_'):
@@ -509,12 +688,7 @@ def start_capture():
             ).start()
 
             # MQTT par caméra
-            try:
-                mqtt_service.publish_binary_sensor_state(
-                    f"capture_active_{camera_id}", True
-                )
-            except Exception:
-                pass
+            _publish_capture_active(ctx, True)
 
             camera_info = camera_service.get_camera_info(camera_id)
             return jsonify({
@@ -527,7 +701,7 @@ def start_capture():
         # ===== MODE HA POLLING ===
         # =========================
         elif source_type == 'ha_polling':
-            if not os.getenv('HA_BASE_URL') or not os.getenv('HA_TOKEN') or not os.getenv('HA_ENTITY_ID'):
+            if not CFG.ha_base_url or not CFG.ha_token or not CFG.ha_entity_id:
                 return jsonify({
                     'success': False,
                     'error': 'Configuration HA incomplète'
@@ -542,12 +716,7 @@ def start_capture():
                 daemon=True
             ).start()
 
-            try:
-                mqtt_service.publish_binary_sensor_state(
-                    f"capture_active_{camera_id}", True
-                )
-            except Exception:
-                pass
+            _publish_capture_active(ctx, True)
 
             return jsonify({
                 'success': True,
@@ -573,24 +742,19 @@ def start_capture():
 def stop_capture():
     """Arrête la capture vidéo pour une ou toutes les caméras"""
     try:
-        data = request.json or {}
+        data = request.get_json(silent=True) or {}
         camera_id = data.get('camera_id')
         
         if camera_id:
             # Arrêter une caméra spécifique
-            if camera_id in camera_contexts:
-                ctx = camera_contexts[camera_id]
-                ctx.is_capturing = False
+            with _contexts_lock:
+                ctx = camera_contexts.pop(camera_id, None)
+            if ctx is not None:
+                ctx.stop()
                 camera_service.stop_capture(camera_id)
                 
                 # Publier l'état de capture (OFF) pour cette caméra
-                try:
-                    mqtt_service.publish_binary_sensor_state(f'capture_active_{camera_id}', False)
-                except Exception:
-                    pass
-                    
-                # Supprimer le contexte
-                del camera_contexts[camera_id]
+                _publish_capture_active(ctx, False)
                 
                 return jsonify({
                     'success': True,
@@ -603,15 +767,14 @@ def stop_capture():
                 }), 404
         else:
             # Arrêter toutes les caméras
-            for cam_id, ctx in camera_contexts.items():
-                ctx.is_capturing = False
-                try:
-                    mqtt_service.publish_binary_sensor_state(f'capture_active_{cam_id}', False)
-                except Exception:
-                    pass
+            with _contexts_lock:
+                contexts = list(camera_contexts.items())
+                camera_contexts.clear()
+            for cam_id, ctx in contexts:
+                ctx.stop()
+                _publish_capture_active(ctx, False)
                     
             camera_service.stop_capture()  # Arrêter toutes
-            camera_contexts.clear()
             
             return jsonify({
                 'success': True,
@@ -635,7 +798,7 @@ def get_detections():
 @app.route('/api/detections', methods=['POST'])
 def add_detection():
     """Ajoute une nouvelle détection personnalisée avec webhook optionnel"""
-    data = request.json
+    data = request.get_json(silent=True) or {}
     name = data.get('name')
     phrase = data.get('phrase')
     webhook_url = data.get('webhook_url')  # Optionnel
@@ -677,7 +840,7 @@ def add_detection():
 def update_detection(detection_id):
     """Met à jour une détection personnalisée (nom, phrase, webhook, caméras)"""
     try:
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         name = data.get('name')
         phrase = data.get('phrase')
         webhook_url = data.get('webhook_url') if 'webhook_url' in data else None
@@ -714,29 +877,37 @@ def delete_detection(detection_id):
 
 @app.route('/api/current_frame/<camera_id>')
 def get_current_frame(camera_id):
-    """Récupère l'image actuelle pour une caméra spécifique"""
+    """Récupère l'image actuelle (JPEG brut) pour une caméra spécifique"""
     ctx = camera_contexts.get(camera_id)
-    if not ctx or ctx.current_frame is None:
+    jpeg = get_encoded_frame(ctx)[0] if ctx else None
+    if jpeg is None:
         return jsonify({'error': 'Aucune image disponible'}), 404
     
-    # Encoder l'image en base64
-    _, buffer = cv2.imencode('.jpg', ctx.current_frame)
-    img_base64 = base64.b64encode(buffer).decode('utf-8')
+    # Servir directement le JPEG partagé avec le flux (pas de base64/JSON)
+    return Response(jpeg, mimetype='image/jpeg', headers={'Cache-Control': 'no-store'})
+
+@app.route('/api/current_frame_b64/<camera_id>')
+def get_current_frame_b64(camera_id):
+    """Récupère l'image actuelle en data-URL base64 (compatibilité anciens clients)"""
+    ctx = camera_contexts.get(camera_id)
+    jpeg = get_encoded_frame(ctx)[0] if ctx else None
+    if jpeg is None:
+        return jsonify({'error': 'Aucune image disponible'}), 404
+    
+    img_base64 = base64.b64encode(jpeg).decode('ascii')
     
     return jsonify({'image': f'data:image/jpeg;base64,{img_base64}'})
 
 @app.route('/video_feed/<camera_id>')
 def video_feed(camera_id):
     """Stream vidéo en temps réel pour une caméra spécifique"""
-    if camera_id not in camera_contexts:
+    ctx = camera_contexts.get(camera_id)
+    if ctx is None:
         return "Camera inconnue", 404
-
-    ctx = camera_contexts[camera_id]
     
     def generate():
         global shutting_down
-        error_count = 0
-        max_errors = 5
+        last_seq = 0
         
         logger.info(f"[{camera_id}] Démarrage du flux vidéo...")
         
@@ -746,81 +917,61 @@ def video_feed(camera_id):
                 if shutting_down:
                     logger.info(f"[{camera_id}] Arrêt du flux vidéo - arrêt application en cours")
                     break
-                try:
-                    if ctx.current_frame is not None:
-                        # Convertir l'image en JPEG avec compression optimisée
-                        encode_params = [cv2.IMWRITE_JPEG_QUALITY, 85]  # Qualité optimisée
-                        success, buffer = cv2.imencode('.jpg', ctx.current_frame, encode_params)
-                        if success:
-                            frame = buffer.tobytes()
-                            yield (b'--frame\r\n'
-                                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-                            error_count = 0  # Réinitialiser le compteur d'erreurs
-                        else:
-                            logger.error(f"[{camera_id}] Erreur d'encodage de l'image")
-                            error_count += 1
-                    else:
-                        logger.debug(f"[{camera_id}] Pas d'image disponible")
-                        error_count += 1
-                        
-                    # Si trop d'erreurs consécutives, arrêter le flux
-                    if error_count > max_errors:
-                        logger.error(f"[{camera_id}] Trop d'erreurs dans le flux vidéo, arrêt du flux")
-                        break
-                        
-                    time.sleep(0.03)
-                except Exception as e:
-                    logger.exception(f"[{camera_id}] Exception dans le flux vidéo: {e}")
-                    error_count += 1
-                    if error_count > max_errors:
-                        logger.error(f"[{camera_id}] Trop d'exceptions dans le flux vidéo, arrêt du flux")
-                        break
-                    time.sleep(0.5)  # Attendre un peu plus longtemps en cas d'erreur
+                # Attendre une nouvelle frame publiée par le producteur (capture_loop / HA polling)
+                with ctx.cond:
+                    ctx.cond.wait_for(
+                        lambda: ctx.frame_seq != last_seq or shutting_down or not ctx.is_capturing,
+                        timeout=1.0
+                    )
+                    if ctx.frame_seq == last_seq:
+                        continue
+                # Encodée par le premier client qui la lit, réutilisée par les autres
+                _, part, seq = get_encoded_frame(ctx)
+                if part is None or seq == last_seq:
+                    # Échec d'encodage: attendre la frame suivante plutôt que réessayer en boucle
+                    logger.debug(f"[{camera_id}] Pas d'image disponible")
+                    last_seq = ctx.frame_seq
+                    continue
+                last_seq = seq
+                # Partie partagée entre clients: aucune copie ni concaténation par client
+                yield part
         finally:
             logger.info(f"[{camera_id}] Flux vidéo fermé")
     
     # Retourner une réponse streaming MJPEG
     logger.info(f"[{camera_id}] Préparation de la réponse streaming MJPEG /video_feed")
-    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    response = Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    response.direct_passthrough = True
+    # Désactiver le buffering d'un reverse proxy (nginx) et tout cache intermédiaire
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 def ha_polling_loop(ctx: CameraContext):
     """Boucle de capture via Home Assistant en utilisant HAService pour une caméra spécifique."""
-    base_url = os.getenv('HA_BASE_URL', '').rstrip('/')
-    token = os.getenv('HA_TOKEN', '')
-    entity_id = os.getenv('HA_ENTITY_ID', '')
-    image_attr = os.getenv('HA_IMAGE_ATTR', 'entity_picture')
-    poll_interval = float(os.getenv('HA_POLL_INTERVAL', '1.0'))
-    min_analysis_interval = float(os.getenv('MIN_ANALYSIS_INTERVAL', '0.1'))
-
-    # Aligner les timeouts HA sur le timeout IA existant par simplicité
-    try:
-        ai_timeout = float(os.getenv('AI_TIMEOUT', '10'))
-    except Exception:
-        ai_timeout = 10.0
+    cfg = CFG
+    min_analysis_interval = cfg.min_analysis_interval
 
     service = HAService(
-        base_url=base_url,
-        token=token,
-        entity_id=entity_id,
-        image_attr=image_attr,
-        poll_interval=poll_interval,
-        state_timeout=ai_timeout,
-        image_timeout=ai_timeout,
+        base_url=cfg.ha_base_url,
+        token=cfg.ha_token,
+        entity_id=cfg.ha_entity_id,
+        image_attr=cfg.ha_image_attr,
+        poll_interval=cfg.ha_poll_interval,
+        # Aligner les timeouts HA sur le timeout IA existant par simplicité
+        state_timeout=cfg.ai_timeout,
+        image_timeout=cfg.ai_timeout,
         logger=logging.getLogger(__name__)
     )
 
     def on_frame(frame):
         # Publier la frame courante
-        ctx.current_frame = frame
+        publish_frame(ctx, frame)
         # Déclencher analyse si intervalle OK
-        current_time = time.time()
-        if not ctx.analysis_in_progress and (current_time - ctx.last_analysis_time) >= min_analysis_interval:
+        if not ctx.analysis_in_progress and (time.perf_counter() - ctx.last_analysis_mono) >= min_analysis_interval:
             ctx.analysis_in_progress = True
-            threading.Thread(
-                target=analyze_frame,
-                args=(ctx, frame.copy(), current_time),
-                daemon=True
-            ).start()
+            # Chaque frame HA est un nouveau tableau décodé jamais modifié ensuite: pas de copie nécessaire
+            _analysis_pool.submit(analyze_frame, ctx, frame, time.perf_counter())
 
     def is_running():
         return ctx.is_capturing
@@ -828,47 +979,60 @@ def ha_polling_loop(ctx: CameraContext):
     service.run_loop(on_frame, is_running)
 
 
+def decode_loop(ctx: CameraContext):
+    """Thread de décodage RTSP: lit les frames en continu et alimente le tampon borné du contexte"""
+    while ctx.is_capturing:
+        try:
+            frame = camera_service.get_frame(ctx.camera_id)
+            if frame is None:
+                # Échec de lecture ou reconnexion en attente: ne pas boucler à vide
+                time.sleep(0.05)
+                continue
+            with ctx.cond:
+                ctx.frame_ring.append(frame)
+                ctx.cond.notify_all()
+        except Exception as e:
+            logger.exception(f"[{ctx.camera_id}] decode_loop error: {e}")
+            time.sleep(0.1)
+
+
 def capture_loop(ctx: CameraContext):
     """Boucle principale de capture RTSP optimisée avec détection de mouvement et cache intelligent"""
+    # Le décodage tourne dans son propre thread; cette boucle ne traite que la frame la plus récente
+    threading.Thread(target=decode_loop, args=(ctx,), daemon=True).start()
+    # Méthodes résolues une seule fois hors de la boucle
+    get_camera_interval = detection_service.get_camera_analysis_interval
+    get_optimized_frame = camera_service.get_optimized_frame_for_ai
     
     while ctx.is_capturing:
         try:
-            frame = camera_service.get_frame(ctx.camera_id)
-            if frame is not None:
-                ctx.current_frame = frame
+            with ctx.cond:
+                ctx.cond.wait_for(lambda: ctx.frame_ring or not ctx.is_capturing, timeout=1.0)
+                if not ctx.frame_ring:
+                    continue
+                frame = ctx.frame_ring.pop()
+                ctx.frame_ring.clear()
+            
+            publish_frame(ctx, frame)
+            
+            # Utiliser la nouvelle méthode d'optimisation IA
+            # Cela inclut la détection de mouvement, le cache, et l'optimisation d'intervalle
+            if not ctx.analysis_in_progress:
+                # Récupérer l'intervalle personnalisé pour cette caméra
+                camera_interval = get_camera_interval(ctx.camera_id)
                 
-                # Utiliser la nouvelle méthode d'optimisation IA
-                # Cela inclut la détection de mouvement, le cache, et l'optimisation d'intervalle
-                if not ctx.analysis_in_progress:
-                    # Récupérer l'intervalle personnalisé pour cette caméra
-                    camera_interval = detection_service.get_camera_analysis_interval(ctx.camera_id)
-                    current_time = time.time()
+                # Vérifier l'intervalle minimum (horloge monotone) ET utiliser les optimisations du CameraService
+                if time.perf_counter() - ctx.last_analysis_mono >= camera_interval:
+                    # Obtenir une frame optimisée (avec détection de mouvement et cache)
+                    optimized_buffer = get_optimized_frame(ctx.camera_id, frame)
                     
-                    # Vérifier l'intervalle minimum ET utiliser les optimisations du CameraService
-                    time_since_last = current_time - ctx.last_analysis_time
-                    if time_since_last >= camera_interval:
-                        # Obtenir une frame optimisée (avec détection de mouvement et cache)
-                        optimized_buffer = camera_service.get_optimized_frame_for_ai(ctx.camera_id)
-                        
-                        if optimized_buffer is not None:
-                            ctx.analysis_in_progress = True
-                            # Convertir le buffer optimisé directement en base64 pour économiser du CPU
-                            img_base64 = base64.b64encode(optimized_buffer).decode('utf-8')
-                            threading.Thread(
-                                target=analyze_optimized_frame,
-                                args=(ctx, img_base64, current_time),
-                                daemon=True
-                            ).start()
-                        else:
-                            logger.debug(f"[{ctx.camera_id}] Frame skippée par les optimisations IA")
-
-            # Cadence alignée sur la source si possible
-            try:
-                fps = camera_service.get_source_fps(ctx.camera_id) if hasattr(camera_service, 'get_source_fps') else None
-                interval = 1.0 / fps if fps and fps > 0 else 0.02
-            except Exception:
-                interval = 0.02
-            time.sleep(interval)
+                    if optimized_buffer is not None:
+                        ctx.analysis_in_progress = True
+                        # Convertir le buffer optimisé directement en base64 pour économiser du CPU
+                        img_base64 = base64.b64encode(optimized_buffer).decode('ascii')
+                        _analysis_pool.submit(analyze_optimized_frame, ctx, img_base64, time.perf_counter())
+                    else:
+                        logger.debug(f"[{ctx.camera_id}] Frame skippée par les optimisations IA")
 
         except Exception as e:
             logger.exception(f"[{ctx.camera_id}] capture_loop error: {e}")
@@ -891,35 +1055,35 @@ def analyze_optimized_frame(ctx: CameraContext, img_base64, start_time):
         mqtt_service.publish_status({
             'camera_id': ctx.camera_id,
             'error': str(e),
-            'duration': time.time() - start_time
+            'duration': time.perf_counter() - start_time
         })
     finally:
         # Marquer l'analyse comme terminée, qu'elle ait réussi ou échoué
         ctx.analysis_in_progress = False
 
+# Motifs d'erreurs IA compilés une seule fois (timeouts / erreurs de connexion réseau)
+_AI_TIMEOUT_RE = re.compile(r'timeout|timed out|deadline exceeded')
+_AI_CONN_RE = re.compile(
+    r'connection error|connection refused|failed to establish a new connection|connection reset|'
+    r'bad gateway|service unavailable|host unreachable|network is unreachable|cannot connect|'
+    r'name or service not known|dns'
+)
+
 def handle_ai_analysis_result(ctx: CameraContext, result, start_time):
     """Traite les résultats de l'IA et gère les erreurs (code mutualisé)"""
     # Détecter erreurs IA (timeouts et erreurs de connexion) et arrêter si nécessaire
     try:
         if isinstance(result, dict):
-            err_text = (str(result.get('error', '')) + ' ' + str(result.get('details', ''))).lower()
+            err_text = f"{result.get('error', '')} {result.get('details', '')}".casefold()
             success_flag = bool(result.get('success', True))
 
-            # Détection de timeout
-            is_timeout = (not success_flag) and any(
-                kw in err_text for kw in ['timeout', 'timed out', 'read timed out', 'deadline exceeded']
-            )
-            # Détection d'erreurs de connexion/réseau
-            is_connection_error = (not success_flag) and any(
-                kw in err_text for kw in [
-                    'connection error', 'connection refused', 'failed to establish a new connection',
-                    'connection reset', 'bad gateway', 'service unavailable', 'host unreachable',
-                    'network is unreachable', 'cannot connect', 'name or service not known', 'dns']
-            )
+            # Détection de timeout / d'erreurs de connexion-réseau (un seul search par motif)
+            is_timeout = (not success_flag) and _AI_TIMEOUT_RE.search(err_text) is not None
+            is_connection_error = (not success_flag) and _AI_CONN_RE.search(err_text) is not None
 
             if success_flag:
                 # Reset sur succès
-                if ctx.ai_consecutive_failures:
+                if ctx.ai_consecutive_failures and logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"[{ctx.camera_id}] Réinitialisation du compteur d'échecs IA ({ctx.ai_consecutive_failures} → 0)")
                 ctx.ai_consecutive_failures = 0
             else:
@@ -934,30 +1098,31 @@ def handle_ai_analysis_result(ctx: CameraContext, result, start_time):
             if ctx.is_capturing and (should_stop_now or failure_threshold_reached):
                 reason = 'timeout IA' if is_timeout else ('erreur de connexion IA' if is_connection_error else 'échecs IA répétés')
                 logger.error(f"[{ctx.camera_id}] 🛑 {reason} - arrêt de la capture")
-                ctx.is_capturing = False
+                ctx.stop()
                 try:
                     camera_service.stop_capture(ctx.camera_id)
                 except Exception as e_stop:
                     logger.warning(f"[{ctx.camera_id}] Erreur lors de l'arrêt de la capture après erreur IA: {e_stop}")
-                try:
-                    mqtt_service.publish_binary_sensor_state(f'{ctx.camera_id}_capture_active', False)
-                except Exception:
-                    pass
+                _publish_capture_active(ctx, False)
     except Exception:
         # Ne pas bloquer l'analyse si la détection d'erreur échoue
         pass
     
-    # Calculer la durée de l'analyse
-    end_time = time.time()
+    # Calculer la durée de l'analyse (start_time et end_time en perf_counter, horloge monotone)
+    end_time = time.perf_counter()
     ctx.last_analysis_duration = end_time - start_time
     # Calculer l'intervalle total (fin -> fin) par rapport à l'analyse précédente
-    ctx.last_analysis_total_interval = end_time - ctx.last_analysis_time if ctx.last_analysis_time else 0
-    ctx.last_analysis_time = end_time
+    ctx.last_analysis_total_interval = end_time - ctx.last_analysis_mono if ctx.last_analysis_time else 0
+    ctx.last_analysis_mono = end_time
+    # Horodatage mural exposé par l'API de statut
+    ctx.last_analysis_time = time.time()
     
-    if ctx.last_analysis_total_interval and ctx.last_analysis_total_interval > 0:
-        logger.info(f"[{ctx.camera_id}] Analyse terminée en {ctx.last_analysis_duration:.2f}s | Intervalle total: {ctx.last_analysis_total_interval:.2f}s | FPS total: {1.0/ctx.last_analysis_total_interval:.2f}")
-    else:
-        logger.info(f"[{ctx.camera_id}] Analyse terminée en {ctx.last_analysis_duration:.2f}s")
+    # Formatage du log uniquement si le niveau INFO est actif (appelé à chaque analyse)
+    if logger.isEnabledFor(logging.INFO):
+        if ctx.last_analysis_total_interval > 0:
+            logger.info(f"[{ctx.camera_id}] Analyse terminée en {ctx.last_analysis_duration:.2f}s | Intervalle total: {ctx.last_analysis_total_interval:.2f}s | FPS total: {1.0/ctx.last_analysis_total_interval:.2f}")
+        else:
+            logger.info(f"[{ctx.camera_id}] Analyse terminée en {ctx.last_analysis_duration:.2f}s")
     
     # Publier les informations d'analyse via MQTT
     mqtt_service.publish_status({
@@ -971,11 +1136,15 @@ def analyze_frame(ctx: CameraContext, frame, start_time):
     """Analyse une image avec l'IA (méthode legacy, conservée pour compatibilité)"""
     try:
         # Redimensionner l'image en 720p (1280x720) pour l'analyse
-        resized_frame = resize_frame_for_analysis(frame)
-
-        # Encoder l'image redimensionnée en base64
-        _, buffer = cv2.imencode('.jpg', resized_frame)
-        img_base64 = base64.b64encode(buffer).decode('utf-8')
+        if ctx.resize_buf is None and frame is not None and frame.shape[:2] != (720, 1280):
+            ctx.resize_buf = np.empty((720, 1280, 3), dtype=np.uint8)
+        resized_frame = resize_frame_for_analysis(frame, dst=ctx.resize_buf)
+
+        # Encoder l'image redimensionnée (libjpeg-turbo si disponible) puis en base64
+        buffer = encode_jpeg(resized_frame, quality=CFG.jpeg_quality)
+        if buffer is None:
+            raise ValueError("Échec de l'encodage JPEG de la frame")
+        img_base64 = base64.b64encode(buffer).decode('ascii')
         
         # Analyser avec les détections configurées
         result = detection_service.analyze_frame(img_base64, ctx.camera_id)
@@ -989,7 +1158,7 @@ def analyze_frame(ctx: CameraContext, frame, start_time):
         mqtt_service.publish_status({
             'camera_id': ctx.camera_id,
             'error': str(e),
-            'duration': time.time() - start_time
+            'duration': time.perf_counter() - start_time
         })
     finally:
         # Marquer l'analyse comme terminée, qu'elle ait réussi ou échoué
@@ -1004,17 +1173,11 @@ def admin():
 def get_admin_config():
     """Récupère la configuration actuelle"""
     try:
-        config = {}
-        
-        # Lire le fichier .env
+        # Lire le fichier .env avec le parseur de python-dotenv (guillemets, échappements, commentaires)
         env_path = '.env'
+        config = {}
         if os.path.exists(env_path):
-            with open(env_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        config[key] = value
+            config = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
         
         # Ajouter les paramètres par défaut s'ils n'existent pas
         defaults = {
@@ -1045,11 +1208,7 @@ def get_admin_config():
             'HA_POLL_INTERVAL': '1.0'
         }
         
-        for key, default_value in defaults.items():
-            if key not in config:
-                config[key] = default_value
-        
-        return jsonify(config)
+        return jsonify({**defaults, **config})
         
     except Exception as e:
         return jsonify({
@@ -1084,11 +1243,8 @@ def admin_mqtt_test():
             # Tentative de connexion rapide (non bloquante)
             try:
                 mqtt_service.connect()
-                t0 = time.time()
-                while time.time() - t0 < 3:
-                    if getattr(mqtt_service, 'is_connected', False):
-                        break
-                    time.sleep(0.2)
+                # Réveil immédiat dès que _on_connect signale la connexion (max 3s)
+                mqtt_service.wait_until_connected(timeout=3.0)
                 status = mqtt_service.get_connection_status()
             except Exception:
                 pass
@@ -1107,7 +1263,7 @@ def admin_rtsp_test():
         except Exception:
             test_url = None
         if not test_url:
-            test_url = os.getenv('DEFAULT_RTSP_URL', '')
+            test_url = CFG.rtsp_url
         status = camera_service._test_rtsp_connection(test_url) if hasattr(camera_service, '_test_rtsp_connection') else 'unsupported'
         return jsonify({
             'success': True,
@@ -1132,6 +1288,12 @@ def admin_hot_reload():
 
         status = {}
 
+        # Recharger la configuration applicative
+        try:
+            reload_app_config()
+        except Exception as e:
+            status['config_error'] = str(e)
+
         # Mettre à jour le niveau de logs dynamiquement
         try:
             lvl_name = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -1171,14 +1333,13 @@ def admin_hot_reload():
         # Recharger caméra (cache/cfg)
         try:
             if hasattr(camera_service, 'refresh_from_env'):
-                camera_service.refresh_from_env()
-                status['camera_refreshed'] = True
+                status['camera_refreshed'] = bool(camera_service.refresh_from_env())
         except Exception as e:
             status['camera_error'] = str(e)
 
         # Mettre à jour l'intervalle d'analyse
         try:
-            detection_service.min_analysis_interval = float(os.getenv('MIN_ANALYSIS_INTERVAL', '0.1'))
+            detection_service.min_analysis_interval = CFG.min_analysis_interval
             status['min_analysis_interval'] = detection_service.min_analysis_interval
         except Exception as e:
             status['min_analysis_interval_error'] = str(e)
@@ -1191,7 +1352,7 @@ def admin_hot_reload():
 def save_admin_config():
     """Sauvegarde la configuration"""
     try:
-        config = request.get_json()
+        config = request.get_json(silent=True)
         
         if not config:
             return jsonify({
@@ -1199,74 +1360,31 @@ def save_admin_config():
                 'error': 'Aucune configuration fournie'
             }), 400
         
-        # Construire le contenu du fichier .env
+        # Construire le contenu du fichier .env (sections et valeurs par défaut: _ENV_SCHEMA)
         env_content = []
-        
-        # Configuration IA
-        env_content.append("# Configuration IA")
-        env_content.append(f"AI_API_MODE={_sanitize_env_value(config.get('AI_API_MODE', 'lmstudio'), 'AI_API_MODE')}")
-        env_content.append(f"AI_TIMEOUT={_sanitize_env_value(config.get('AI_TIMEOUT', '10'), 'AI_TIMEOUT')}")
-        env_content.append("")
-
-        # Configuration Logs
-        env_content.append("# Configuration Logs")
-        env_content.append(f"LOG_LEVEL={_sanitize_env_value(config.get('LOG_LEVEL', 'INFO'), 'LOG_LEVEL')}")
-        env_content.append("")
-        
-        # Configuration OpenAI
-        env_content.append("# Configuration OpenAI")
-        env_content.append(f"OPENAI_API_KEY={_sanitize_env_value(config.get('OPENAI_API_KEY', ''), 'OPENAI_API_KEY')}")
-        env_content.append(f"OPENAI_MODEL={_sanitize_env_value(config.get('OPENAI_MODEL', 'gpt-4-vision-preview'), 'OPENAI_MODEL')}")
-        env_content.append("")
-        
-        # Configuration LM Studio
-        env_content.append("# Configuration LM Studio")
-        env_content.append(f"LMSTUDIO_URL={_sanitize_env_value(config.get('LMSTUDIO_URL', 'http://127.0.0.1:11434/v1'), 'LMSTUDIO_URL')}")
-        env_content.append(f"LMSTUDIO_MODEL={_sanitize_env_value(config.get('LMSTUDIO_MODEL', ''), 'LMSTUDIO_MODEL')}")
-        env_content.append("")
-        
-        # Configuration Ollama
-        env_content.append("# Configuration Ollama")
-        env_content.append(f"OLLAMA_URL={_sanitize_env_value(config.get('OLLAMA_URL', 'http://127.0.0.1:11434/v1'), 'OLLAMA_URL')}")
-        env_content.append(f"OLLAMA_MODEL={_sanitize_env_value(config.get('OLLAMA_MODEL', ''), 'OLLAMA_MODEL')}")
-        env_content.append("")
-        
-        # Configuration MQTT
-        env_content.append("# Configuration MQTT")
-        env_content.append(f"MQTT_BROKER={_sanitize_env_value(config.get('MQTT_BROKER', '127.0.0.1'), 'MQTT_BROKER')}")
-        env_content.append(f"MQTT_PORT={_sanitize_env_value(config.get('MQTT_PORT', '1883'), 'MQTT_PORT')}")
-        env_content.append(f"MQTT_USERNAME={_sanitize_env_value(config.get('MQTT_USERNAME', ''), 'MQTT_USERNAME')}")
-        env_content.append(f"MQTT_PASSWORD={_sanitize_env_value(config.get('MQTT_PASSWORD', ''), 'MQTT_PASSWORD')}")
-        env_content.append("")
-        
-        # Configuration Home Assistant
-        env_content.append("\n# Configuration Home Assistant")
-        env_content.append(f"HA_DEVICE_NAME={_sanitize_env_value(config.get('HA_DEVICE_NAME', 'IAction'), 'HA_DEVICE_NAME')}")
-        env_content.append(f"HA_DEVICE_ID={_sanitize_env_value(config.get('HA_DEVICE_ID', 'iaction_camera'), 'HA_DEVICE_ID')}")
-        env_content.append("")
-        
-        # Configuration Caméra
-        env_content.append("\n# Configuration Caméra")
-        env_content.append(f"CAPTURE_MODE={_sanitize_env_value(config.get('CAPTURE_MODE', 'rtsp'), 'CAPTURE_MODE')}")
-        env_content.append(f"DEFAULT_RTSP_URL={_sanitize_env_value(config.get('DEFAULT_RTSP_URL', ''), 'DEFAULT_RTSP_URL')}")
-        env_content.append(f"RTSP_USERNAME={_sanitize_env_value(config.get('RTSP_USERNAME', ''), 'RTSP_USERNAME')}")
-        env_content.append(f"RTSP_PASSWORD={_sanitize_env_value(config.get('RTSP_PASSWORD', ''), 'RTSP_PASSWORD')}")
-
-        # Configuration HA Polling
-        env_content.append("\n# Configuration HA Polling")
-        env_content.append(f"HA_BASE_URL={_sanitize_env_value(config.get('HA_BASE_URL', ''), 'HA_BASE_URL')}")
-        env_content.append(f"HA_TOKEN={_sanitize_env_value(config.get('HA_TOKEN', ''), 'HA_TOKEN')}")
-        env_content.append(f"HA_ENTITY_ID={_sanitize_env_value(config.get('HA_ENTITY_ID', ''), 'HA_ENTITY_ID')}")
-        env_content.append(f"HA_IMAGE_ATTR={_sanitize_env_value(config.get('HA_IMAGE_ATTR', 'entity_picture'), 'HA_IMAGE_ATTR')}")
-        env_content.append(f"HA_POLL_INTERVAL={_sanitize_env_value(config.get('HA_POLL_INTERVAL', '1.0'), 'HA_POLL_INTERVAL')}")
-
-        # Configuration Analyse
-        env_content.append("\n# Configuration Analyse")
-        env_content.append(f"MIN_ANALYSIS_INTERVAL={_sanitize_env_value(config.get('MIN_ANALYSIS_INTERVAL', '0.1'), 'MIN_ANALYSIS_INTERVAL')}")
-
-        # Écrire le fichier .env
-        with open('.env', 'w', encoding='utf-8') as f:
-            f.write('\n'.join(env_content))
+        for header, keys in _ENV_SCHEMA:
+            env_content.append(header)
+            env_content.extend(f"{key}={_sanitize_env_value(config.get(key, default), key)}" for key, default in keys)
+            env_content.append("")
+
+        # Écrire le fichier .env de façon atomique (fichier temporaire + rename):
+        # get_admin_config / load_dotenv ne lisent jamais un fichier à moitié écrit
+        content = '\n'.join(env_content)
+        tmp_path = '.env.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(tmp_path, '.env')
+        except OSError:
+            # .env monté en bind (Docker): rename impossible, écriture directe
+            with open('.env', 'w', encoding='utf-8') as f:
+                f.write(content)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
         
         return jsonify({
             'success': True,
@@ -1284,20 +1402,24 @@ def get_cameras_status():
     """Récupère le statut de toutes les caméras configurées"""
     try:
         cameras_status = {}
-        for camera_id, ctx in camera_contexts.items():
+        active = 0
+        # Un seul passage: statut par caméra et compteur des captures actives
+        for camera_id, ctx in _contexts_snapshot():
+            capturing = ctx.is_capturing
             cameras_status[camera_id] = {
                 'id': camera_id,
-                'is_capturing': ctx.is_capturing,
+                'is_capturing': capturing,
                 'last_analysis_time': ctx.last_analysis_time,
                 'last_analysis_duration': ctx.last_analysis_duration,
                 'analysis_in_progress': ctx.analysis_in_progress
             }
+            active += capturing
         
-        return jsonify({
+        return _fast_json({
             'success': True,
             'cameras': cameras_status,
-            'total_cameras': len(camera_contexts),
-            'active_cameras': len([ctx for ctx in camera_contexts.values() if ctx.is_capturing])
+            'total_cameras': len(cameras_status),
+            'active_cameras': active
         })
     except Exception as e:
         return jsonify({
@@ -1305,11 +1427,93 @@ def get_cameras_status():
             'error': str(e)
         }), 500
 
+def _probe_camera_config(camera_config):
+    """Teste une configuration de caméra (RTSP ou HA) sans la démarrer et retourne le résultat"""
+    camera_id = camera_config.get('id', 'unknown')
+    camera_name = camera_config.get('name', f'Caméra {camera_id}')
+    mode = camera_config.get('mode', 'rtsp')
+    
+    try:
+        if mode == 'rtsp':
+            rtsp_url = camera_config.get('rtsp_url')
+            if not rtsp_url:
+                return {
+                    'camera_id': camera_id,
+                    'camera_name': camera_name,
+                    'success': False,
+                    'status': 'not_configured',
+                    'message': 'URL RTSP manquante'
+                }
+            
+            # Test de connexion RTSP (sans démarrer l'analyse)
+            if hasattr(camera_service, '_test_rtsp_connection'):
+                test_status = camera_service._test_rtsp_connection(rtsp_url)
+            else:
+                test_status = 'unsupported'
+            
+            return {
+                'camera_id': camera_id,
+                'camera_name': camera_name,
+                'success': test_status == 'online',
+                'status': test_status,
+                'message': f'Test RTSP: {test_status}',
+                'url': rtsp_url
+            }
+            
+        elif mode == 'ha_polling':
+            ha_entity = camera_config.get('ha_entity')
+            if not ha_entity:
+                return {
+                    'camera_id': camera_id,
+                    'camera_name': camera_name,
+                    'success': False,
+                    'status': 'not_configured',
+                    'message': 'Entité Home Assistant manquante'
+                }
+            
+            # Test basique de configuration HA
+            ha_url = os.getenv('HA_URL', '')
+            ha_token = os.getenv('HA_TOKEN', '')
+            
+            if not ha_url or not ha_token:
+                return {
+                    'camera_id': camera_id,
+                    'camera_name': camera_name,
+                    'success': False,
+                    'status': 'not_configured',
+                    'message': 'Configuration Home Assistant incomplète'
+                }
+            
+            return {
+                'camera_id': camera_id,
+                'camera_name': camera_name,
+                'success': True,
+                'status': 'configured',
+                'message': f'Configuration HA OK: {ha_entity}'
+            }
+            
+        return {
+            'camera_id': camera_id,
+            'camera_name': camera_name,
+            'success': False,
+            'status': 'error',
+            'message': f'Mode non supporté: {mode}'
+        }
+            
+    except Exception as e:
+        return {
+            'camera_id': camera_id,
+            'camera_name': camera_name,
+            'success': False,
+            'status': 'error',
+            'message': f'Erreur test: {str(e)}'
+        }
+
 @app.route('/api/admin/cameras/test_multiple', methods=['POST'])
 def test_multiple_cameras():
     """Teste la connexion de plusieurs caméras sans les démarrer"""
     try:
-        data = request.json or {}
+        data = request.get_json(silent=True) or {}
         cameras_config = data.get('cameras', [])
         
         if not cameras_config:
@@ -1318,92 +1522,9 @@ def test_multiple_cameras():
                 'error': 'Aucune caméra à tester'
             }), 400
         
-        results = []
-        
-        for camera_config in cameras_config:
-            camera_id = camera_config.get('id', 'unknown')
-            camera_name = camera_config.get('name', f'Caméra {camera_id}')
-            mode = camera_config.get('mode', 'rtsp')
-            
-            try:
-                if mode == 'rtsp':
-                    rtsp_url = camera_config.get('rtsp_url')
-                    if not rtsp_url:
-                        results.append({
-                            'camera_id': camera_id,
-                            'camera_name': camera_name,
-                            'success': False,
-                            'status': 'not_configured',
-                            'message': 'URL RTSP manquante'
-                        })
-                        continue
-                    
-                    # Test de connexion RTSP (sans démarrer l'analyse)
-                    if hasattr(camera_service, '_test_rtsp_connection'):
-                        test_status = camera_service._test_rtsp_connection(rtsp_url)
-                    else:
-                        test_status = 'unsupported'
-                    
-                    results.append({
-                        'camera_id': camera_id,
-                        'camera_name': camera_name,
-                        'success': test_status == 'online',
-                        'status': test_status,
-                        'message': f'Test RTSP: {test_status}',
-                        'url': rtsp_url
-                    })
-                    
-                elif mode == 'ha_polling':
-                    ha_entity = camera_config.get('ha_entity')
-                    if not ha_entity:
-                        results.append({
-                            'camera_id': camera_id,
-                            'camera_name': camera_name,
-                            'success': False,
-                            'status': 'not_configured',
-                            'message': 'Entité Home Assistant manquante'
-                        })
-                        continue
-                    
-                    # Test basique de configuration HA
-                    ha_url = os.getenv('HA_URL', '')
-                    ha_token = os.getenv('HA_TOKEN', '')
-                    
-                    if not ha_url or not ha_token:
-                        results.append({
-                            'camera_id': camera_id,
-                            'camera_name': camera_name,
-                            'success': False,
-                            'status': 'not_configured',
-                            'message': 'Configuration Home Assistant incomplète'
-                        })
-                        continue
-                    
-                    results.append({
-                        'camera_id': camera_id,
-                        'camera_name': camera_name,
-                        'success': True,
-                        'status': 'configured',
-                        'message': f'Configuration HA OK: {ha_entity}'
-                    })
-                    
-                else:
-                    results.append({
-                        'camera_id': camera_id,
-                        'camera_name': camera_name,
-                        'success': False,
-                        'status': 'error',
-                        'message': f'Mode non supporté: {mode}'
-                    })
-                    
-            except Exception as e:
-                results.append({
-                    'camera_id': camera_id,
-                    'camera_name': camera_name,
-                    'success': False,
-                    'status': 'error',
-                    'message': f'Erreur test: {str(e)}'
-                })
+        # Tests RTSP (I/O bloquantes) lancés en parallèle; l'ordre des résultats est conservé
+        with ThreadPoolExecutor(max_workers=min(len(cameras_config), 16), thread_name_prefix='camera_probe') as executor:
+            results = list(executor.map(_probe_camera_config, cameras_config))
         
         success_count = sum(1 for r in results if r['success'])
         total_count = len(results)
@@ -1424,11 +1545,79 @@ def test_multiple_cameras():
             'error': str(e)
         }), 500
 
+def _start_camera_from_config(camera_config):
+    """Démarre une caméra depuis sa configuration admin et retourne le résultat (None si mode inconnu)"""
+    camera_id = camera_config.get('id', 'unknown')
+    try:
+        # Créer le contexte caméra si inexistant
+        ctx, created = _get_or_create_context(camera_id)
+        if created:
+            # Enregistrer la caméra avec le service de détection
+            detection_service.register_camera(camera_id)
+        
+        # Verrou de la caméra: un même id présent deux fois ne peut pas être démarré en double
+        with ctx.lock:
+            if ctx.is_capturing:
+                return {
+                    'camera_id': camera_id,
+                    'success': False,
+                    'message': f'Caméra {camera_id} déjà en cours'
+                }
+            
+            mode = camera_config.get('mode', 'rtsp')
+            
+            if mode == 'rtsp':
+                rtsp_url = camera_config.get('rtsp_url')
+                if not rtsp_url:
+                    return {
+                        'camera_id': camera_id,
+                        'success': False,
+                        'message': 'URL RTSP manquante'
+                    }
+                
+                success = camera_service.start_capture(camera_id, rtsp_url, 'rtsp')
+                if not success:
+                    return {
+                        'camera_id': camera_id,
+                        'success': False,
+                        'message': 'Échec démarrage RTSP'
+                    }
+                
+                ctx.is_capturing = True
+                # Boucle de capture longue durée: thread dédié (ne doit pas occuper un worker de pool)
+                threading.Thread(target=capture_loop, args=(ctx,), daemon=True).start()
+                
+                _publish_capture_active(ctx, True)
+                
+                return {
+                    'camera_id': camera_id,
+                    'success': True,
+                    'message': f'RTSP démarré pour {camera_id}'
+                }
+                
+            elif mode == 'ha_polling':
+                # Configuration HA polling pour cette caméra spécifique
+                # TODO: Implémenter le support HA polling multi-caméra
+                return {
+                    'camera_id': camera_id,
+                    'success': False,
+                    'message': 'HA Polling multi-caméra pas encore implémenté'
+                }
+        
+        return None
+        
+    except Exception as e:
+        return {
+            'camera_id': camera_id,
+            'success': False,
+            'message': f'Erreur: {str(e)}'
+        }
+
 @app.route('/api/admin/cameras/start_multiple', methods=['POST'])
 def start_multiple_cameras():
     """Démarre plusieurs caméras depuis la configuration admin"""
     try:
-        data = request.json or {}
+        data = request.get_json(silent=True) or {}
         cameras_config = data.get('cameras', [])
         
         if not cameras_config:
@@ -1437,77 +1626,9 @@ def start_multiple_cameras():
                 'error': 'Aucune caméra à démarrer'
             }), 400
         
-        results = []
-        
-        for camera_config in cameras_config:
-            camera_id = camera_config.get('id', 'unknown')
-            try:
-                # Créer le contexte caméra si inexistant
-                if camera_id not in camera_contexts:
-                    camera_contexts[camera_id] = CameraContext(camera_id)
-                    # Enregistrer la caméra avec le service de détection
-                    detection_service.register_camera(camera_id)
-                
-                ctx = camera_contexts[camera_id]
-                
-                if ctx.is_capturing:
-                    results.append({
-                        'camera_id': camera_id,
-                        'success': False,
-                        'message': f'Caméra {camera_id} déjà en cours'
-                    })
-                    continue
-                
-                mode = camera_config.get('mode', 'rtsp')
-                
-                if mode == 'rtsp':
-                    rtsp_url = camera_config.get('rtsp_url')
-                    if not rtsp_url:
-                        results.append({
-                            'camera_id': camera_id,
-                            'success': False,
-                            'message': 'URL RTSP manquante'
-                        })
-                        continue
-                    
-                    success = camera_service.start_capture(camera_id, rtsp_url, 'rtsp')
-                    if not success:
-                        results.append({
-                            'camera_id': camera_id,
-                            'success': False,
-                            'message': 'Échec démarrage RTSP'
-                        })
-                        continue
-                    
-                    ctx.is_capturing = True
-                    threading.Thread(target=capture_loop, args=(ctx,), daemon=True).start()
-                    
-                    try:
-                        mqtt_service.publish_binary_sensor_state(f"capture_active_{camera_id}", True)
-                    except Exception:
-                        pass
-                    
-                    results.append({
-                        'camera_id': camera_id,
-                        'success': True,
-                        'message': f'RTSP démarré pour {camera_id}'
-                    })
-                    
-                elif mode == 'ha_polling':
-                    # Configuration HA polling pour cette caméra spécifique
-                    # TODO: Implémenter le support HA polling multi-caméra
-                    results.append({
-                        'camera_id': camera_id,
-                        'success': False,
-                        'message': 'HA Polling multi-caméra pas encore implémenté'
-                    })
-                
-            except Exception as e:
-                results.append({
-                    'camera_id': camera_id,
-                    'success': False,
-                    'message': f'Erreur: {str(e)}'
-                })
+        # Connexions RTSP (bloquantes) ouvertes en parallèle; l'ordre des résultats est conservé
+        with ThreadPoolExecutor(max_workers=min(len(cameras_config), 8), thread_name_prefix='camera_start') as executor:
+            results = [r for r in executor.map(_start_camera_from_config, cameras_config) if r is not None]
         
         success_count = len([r for r in results if r['success']])
         
@@ -1555,12 +1676,8 @@ def shutdown_app():
         if ra not in ('127.0.0.1', '::1'):
             return jsonify({'success': False, 'error': 'Accès refusé'}), 403
         logger.info("Demande d'arrêt via /api/admin/shutdown")
-        cleanup()
-        # Sortie différée pour laisser la réponse HTTP partir
-        def _exit():
-            time.sleep(0.2)
-            os._exit(0)
-        threading.Thread(target=_exit, daemon=True).start()
+        # Arrêt différé (thread principal) pour laisser la réponse HTTP partir
+        threading.Timer(0.2, _shutdown_event.set).start()
         return jsonify({'success': True, 'message': 'Arrêt en cours...'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1569,7 +1686,7 @@ def shutdown_app():
 def update_camera_interval():
     """Met à jour l'intervalle d'analyse pour une caméra spécifique"""
     try:
-        data = request.json or {}
+        data = request.get_json(silent=True) or {}
         camera_id = data.get('camera_id')
         interval = data.get('interval')
         
@@ -1629,6 +1746,21 @@ def update_camera_interval():
             'message': f'Erreur serveur: {str(e)}'
         }), 500
 
+def _release_resource(label, fn, *args, **kwargs):
+    """Libère une ressource sans interrompre le reste de l'arrêt"""
+    try:
+        fn(*args, **kwargs)
+    except Exception as e:
+        logger.warning(f"Erreur lors de {label}: {e}")
+
+# Ressources libérables, fermées en ordre LIFO par cleanup() (unique chemin d'arrêt):
+# captures RTSP, puis analyses en attente, puis MQTT en dernier (publication des états OFF)
+_exit_stack = contextlib.ExitStack()
+_exit_stack.callback(_release_resource, "la déconnexion MQTT", mqtt_service.disconnect)
+# Abandonner les analyses en attente (celles en cours se terminent sur timeout IA)
+_exit_stack.callback(_release_resource, "l'arrêt du pool d'analyse", _analysis_pool.shutdown, wait=False, cancel_futures=True)
+_exit_stack.callback(_release_resource, "l'arrêt des caméras", camera_service.stop_capture)
+
 # Fonction pour nettoyer les ressources avant l'arrêt de l'application
 def cleanup():
     global shutting_down
@@ -1639,61 +1771,34 @@ def cleanup():
     shutting_down = True
     
     # Arrêter toutes les caméras
-    for camera_id, ctx in camera_contexts.items():
-        ctx.is_capturing = False
-        try:
-            # Publier l'état de capture (OFF) avant de se déconnecter
-            mqtt_service.publish_binary_sensor_state(f'capture_active_{camera_id}', False)
-        except Exception:
-            pass
-    
-    try:
-        camera_service.stop_capture()  # Arrêter toutes les captures
-    except Exception as e:
-        logger.warning(f"Erreur lors de l'arrêt des caméras: {e}")
+    for camera_id, ctx in _contexts_snapshot():
+        ctx.stop()
+        _publish_capture_active(ctx, False)
     
-    try:
-        mqtt_service.disconnect()
-    except Exception as e:
-        logger.warning(f"Erreur lors de la déconnexion MQTT: {e}")
+    _exit_stack.close()
         
     # Vider le registre des caméras
-    camera_contexts.clear()
+    with _contexts_lock:
+        camera_contexts.clear()
 
-# Enregistrer la fonction de nettoyage pour qu'elle soit appelée à la fermeture
-import atexit
-atexit.register(cleanup)
+# Posé par les handlers de signaux / l'API d'arrêt: le thread principal effectue alors l'arrêt
+_shutdown_event = threading.Event()
 
 if __name__ == '__main__':
-    # Gestion des signaux (Ctrl+C / arrêt système)
+    # Gestion des signaux (Ctrl+C / arrêt système): un seul handler qui réveille le thread principal,
+    # l'arrêt (cleanup + fermeture du serveur) se fait ensuite hors contexte de signal, une seule fois
     try:
         import signal
         def _handle_signal(signum, frame):
             logger.info(f"Signal reçu ({signum}), arrêt en cours...")
-            try:
-                cleanup()
-            finally:
-                # Petite attente pour laisser finir les réponses HTTP
-                time.sleep(0.2)
-                os._exit(0)
-        signal.signal(signal.SIGINT, _handle_signal)
-        if hasattr(signal, 'SIGTERM'):
-            signal.signal(signal.SIGTERM, _handle_signal)
-        # Sous Windows, gérer aussi Ctrl+Pause (SIGBREAK)
-        if hasattr(signal, 'SIGBREAK'):
-            signal.signal(signal.SIGBREAK, _handle_signal)
+            _shutdown_event.set()
+        for _sig_name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):  # SIGBREAK: Ctrl+Pause sous Windows
+            if hasattr(signal, _sig_name):
+                signal.signal(getattr(signal, _sig_name), _handle_signal)
     except Exception:
         # En cas d'échec, on poursuivra sans handler explicite
         pass
     logger.info("=== DÉMARRAGE IACTION ===")
-    # Si ce processus est lancé par un redémarrage, attendre la libération du port HTTP
-    try:
-        if os.environ.get('IACTION_WAIT_FOR_PID'):
-            logger.info("⏳ Attente de la libération du port 5002 par l'ancien processus (bind test)...")
-            _wait_until_bind_possible('0.0.0.0', 5002, timeout=10.0)
-        os.environ.pop('IACTION_WAIT_FOR_PID', None)
-    except Exception:
-        pass
     logger.info("Tentative de connexion au broker MQTT...")
     
     # Initier la connexion MQTT
@@ -1702,23 +1807,28 @@ if __name__ == '__main__':
     # Attendre que la connexion soit établie (ou échoue)
     logger.info("Vérification de la connexion MQTT...")
     max_wait = 10  # Attendre maximum 10 secondes
-    wait_time = 0
     
-    while wait_time < max_wait:
-        if mqtt_service.is_connected:
-            logger.info("✅ MQTT: Connexion réussie au broker")
-            logger.info("✅ MQTT: Capteurs configurés pour Home Assistant")
-            # Reconfigurer les capteurs des détections après connexion MQTT
-            try:
-                if hasattr(detection_service, 'reconfigure_mqtt_sensors'):
-                    detection_service.reconfigure_mqtt_sensors()
-            except Exception as e:
-                logger.error(f"Erreur reconfiguration MQTT des détections: {e}")
+    # Réveil immédiat à la connexion (Event posé par _on_connect); trace de progression toutes les 3s
+    waited = 0
+    connected = False
+    while waited < max_wait:
+        step = min(3, max_wait - waited)
+        connected = mqtt_service.wait_until_connected(timeout=step)
+        if connected:
             break
-        time.sleep(1)
-        wait_time += 1
-        if wait_time % 3 == 0:
-            logger.info(f"⏳ MQTT: Tentative de connexion... ({wait_time}/{max_wait}s)")
+        waited += step
+        if waited < max_wait:
+            logger.info(f"⏳ MQTT: Tentative de connexion... ({waited}/{max_wait}s)")
+    
+    if connected:
+        logger.info("✅ MQTT: Connexion réussie au broker")
+        logger.info("✅ MQTT: Capteurs configurés pour Home Assistant")
+        # Reconfigurer les capteurs des détections après connexion MQTT
+        try:
+            if hasattr(detection_service, 'reconfigure_mqtt_sensors'):
+                detection_service.reconfigure_mqtt_sensors()
+        except Exception as e:
+            logger.error(f"Erreur reconfiguration MQTT des détections: {e}")
     
     if not mqtt_service.is_connected:
         logger.error("❌ MQTT: Connexion échouée - Les capteurs ne seront pas disponibles")
@@ -1733,14 +1843,48 @@ if __name__ == '__main__':
     os.environ.pop('WERKZEUG_RUN_MAIN', None)
     os.environ.pop('WERKZEUG_SERVER_FD', None)
 
+    logger.info(f"Mode: {'DEBUG' if debug_mode else 'PRODUCTION'}")
     try:
-        if debug_mode:
-            logger.info("Mode: DEBUG")
-            _run_web_server_with_retry(host='0.0.0.0', port=5002, debug=True)
+        run_server, stop_server = _create_web_server(host='0.0.0.0', port=5002, debug=debug_mode)
+    except Exception as e:
+        # Port déjà utilisé (autre instance ?) ou serveur indisponible: inutile de tourner sans HTTP
+        logger.critical(f"❌ Impossible de démarrer le serveur web: {e}")
+        cleanup()
+        os._exit(1)
+
+    server_failed = threading.Event()
+
+    def _serve():
+        """Sert les requêtes; toute sortie du serveur (exception ou retour) hors arrêt demandé arrête le processus"""
+        try:
+            run_server()
+            if not _shutdown_event.is_set():
+                logger.critical("❌ Le serveur web s'est arrêté de façon inattendue")
+                server_failed.set()
+        except BaseException:
+            # Une erreur levée par stop() pendant un arrêt demandé n'est pas un échec
+            if not _shutdown_event.is_set():
+                logger.critical("❌ Le serveur web s'est arrêté sur une erreur", exc_info=True)
+                server_failed.set()
+        finally:
+            _shutdown_event.set()
+
+    threading.Thread(target=_serve, name='web_server', daemon=True).start()
+
+    try:
+        if is_windows:
+            # Sous Windows une attente sans timeout n'est pas interrompue par Ctrl+C
+            while not _shutdown_event.wait(timeout=1.0):
+                pass
         else:
-            logger.info("Mode: PRODUCTION")
-            _run_web_server_with_retry(host='0.0.0.0', port=5002, debug=False)
+            _shutdown_event.wait()
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt reçu, arrêt en cours...")
-        cleanup()
-        os._exit(0)
+
+    cleanup()
+    try:
+        stop_server()
+    except Exception as e:
+        logger.debug(f"Arrêt du serveur web ignoré: {e}")
+    # Sortie immédiate: ne pas attendre les analyses IA encore en vol dans le pool
+    os._exit(1 if server_failed.is_set() else 0)
@@ -0,0 +1,140 @@
+import logging
+import os
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# PyAV (bindings FFmpeg) optionnel: backend de capture RTSP alternatif à cv2.VideoCapture
+try:
+    import av
+except ImportError:
+    av = None
+
+# Décodage matériel PyAV (PyAV >= 14): HWAccel(device_type='cuda'|'vaapi'|'qsv'|...)
+try:
+    from av.codec.hwaccel import HWAccel
+except ImportError:
+    HWAccel = None
+
+
+def _ffmpeg_options_from_env():
+    """Options FFmpeg au format OpenCV (clé;valeur|clé;valeur) converties en dict pour av.open"""
+    raw = os.getenv('OPENCV_FFMPEG_CAPTURE_OPTIONS', '')
+    options = {}
+    for item in raw.split('|'):
+        key, sep, value = item.partition(';')
+        if sep and key.strip():
+            options[key.strip()] = value.strip()
+    return options
+
+
+class PyAVCapture:
+    """Capture RTSP via PyAV exposant l'interface de cv2.VideoCapture utilisée par CameraService.
+    grab() démultiplexe et décode (indispensable pour la chaîne de références H.264) mais garde la frame
+    en YUV; la conversion BGR n'a lieu que dans retrieve(), donc uniquement pour la frame conservée.
+    """
+
+    def __init__(self, url=None, timeout_ms=3000, hwaccel=None, threads=0):
+        self._container = None
+        self._stream = None
+        self._packets = None
+        self._frame = None
+        # Taille cible demandée via set(CAP_PROP_FRAME_WIDTH/HEIGHT), appliquée par swscale dans retrieve()
+        self._target_w = 0
+        self._target_h = 0
+        if url:
+            self.open(url, timeout_ms=timeout_ms, hwaccel=hwaccel, threads=threads)
+
+    def open(self, url, timeout_ms=3000, hwaccel=None, threads=0):
+        """Ouvre (ou rouvre) le flux; hwaccel: type de périphérique FFmpeg (ex: 'cuda'), ignoré si non supporté;
+        threads: threads de décodage (0 = automatique)
+        """
+        self.release()
+        timeout_s = timeout_ms / 1000.0
+        kwargs = {}
+        if hwaccel and hwaccel != 'any' and HWAccel is not None:
+            # allow_software_fallback: décodage CPU si le périphérique est absent
+            kwargs['hwaccel'] = HWAccel(device_type=hwaccel, allow_software_fallback=True)
+        try:
+            self._container = av.open(url, options=_ffmpeg_options_from_env(), timeout=(timeout_s, timeout_s), **kwargs)
+            self._stream = self._container.streams.video[0]
+            self._stream.thread_type = 'AUTO'
+            if threads:
+                self._stream.codec_context.thread_count = threads
+            self._packets = self._container.demux(self._stream)
+            return True
+        except Exception as e:
+            logger.debug(f"PyAV: ouverture impossible de {str(url)[:50]}: {e}")
+            self.release()
+            return False
+
+    def isOpened(self):
+        return self._container is not None
+
+    def grab(self):
+        """Avance jusqu'à la prochaine frame décodée (sans conversion BGR)"""
+        if self._packets is None:
+            return False
+        try:
+            for packet in self._packets:
+                for frame in packet.decode():
+                    self._frame = frame
+                    return True
+        except Exception as e:
+            logger.debug(f"PyAV: lecture interrompue: {e}")
+        # Fin de flux ou erreur réseau: fermer pour déclencher la reconnexion
+        self.release()
+        return False
+
+    def retrieve(self):
+        """Convertit la dernière frame en BGR; réduite à la taille cible (ratio conservé) dans la même passe swscale"""
+        frame = self._frame
+        if frame is None:
+            return False, None
+        if self._target_w and self._target_h and (frame.width > self._target_w or frame.height > self._target_h):
+            scale = min(self._target_w / frame.width, self._target_h / frame.height)
+            # Dimensions paires pour les formats YUV sous-échantillonnés
+            width = max(2, int(frame.width * scale) & ~1)
+            height = max(2, int(frame.height * scale) & ~1)
+            return True, frame.reformat(width=width, height=height, format='bgr24', interpolation='FAST_BILINEAR').to_ndarray()
+        return True, frame.to_ndarray(format='bgr24')
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop):
+        if self._stream is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            rate = self._stream.average_rate or self._stream.guessed_rate
+            return float(rate) if rate else 0.0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._stream.codec_context.width or 0)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._stream.codec_context.height or 0)
+        return 0.0
+
+    def set(self, prop, value):
+        # Résolution: réduction au décodage (retrieve); FPS/tampon imposés par la caméra
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self._target_w = int(value)
+            return True
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self._target_h = int(value)
+            return True
+        return False
+
+    def release(self):
+        container = self._container
+        self._container = None
+        self._stream = None
+        self._packets = None
+        self._frame = None
+        if container is not None:
+            try:
+                container.close()
+            except Exception:
+                pass
@@ -1,105 +1,277 @@
 import cv2
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
-import hashlib
+import random
 import numpy as np
 from PIL import Image
 import io
 from dotenv import load_dotenv
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse
 import logging
+from services.av_capture import PyAVCapture, av
+from services.cudacodec_capture import CudaCodecCapture, cudacodec_available
+from services.image_encoder import encode_jpeg
 
 logger = logging.getLogger(__name__)
 
+# Options FFMPEG des captures RTSP (lues par OpenCV à chaque ouverture): transport TCP (pas de
+# réordonnancement/pertes UDP) et démultiplexage sans tampon pour une latence minimale.
+# Surchargeable en définissant OPENCV_FFMPEG_CAPTURE_OPTIONS dans l'environnement.
+os.environ.setdefault(
+    'OPENCV_FFMPEG_CAPTURE_OPTIONS',
+    'rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|max_delay;500000'
+)
+
+
+# Backend de capture RTSP: 'opencv' (défaut), 'pyav' (nécessite le paquet av)
+# ou 'cudacodec' (décodage NVDEC, nécessite OpenCV compilé avec CUDA et un GPU NVIDIA)
+def resolve_capture_class(backend):
+    """Classe de capture alternative à cv2.VideoCapture pour le backend demandé (None = OpenCV)"""
+    backend = (backend or 'opencv').strip().lower()
+    if backend == 'pyav' and av is None:
+        logger.warning("RTSP_BACKEND=pyav mais PyAV n'est pas installé: utilisation d'OpenCV")
+        return None
+    if backend == 'cudacodec' and not cudacodec_available():
+        logger.warning("RTSP_BACKEND=cudacodec mais OpenCV CUDA/GPU indisponible: utilisation d'OpenCV")
+        return None
+    return {'pyav': PyAVCapture, 'cudacodec': CudaCodecCapture}.get(backend)
+
+
+def new_rtsp_capture(capture_class=None):
+    """Objet de capture non ouvert du backend donné (à ouvrir via reopen_rtsp_capture)"""
+    return capture_class() if capture_class is not None else cv2.VideoCapture()
+
+
+# Décodage matériel OpenCV (RTSP_HWACCEL par caméra): nom -> cv2.VIDEO_ACCELERATION_* (OpenCV >= 4.5.2)
+_CV_HWACCEL = {
+    'any': 'VIDEO_ACCELERATION_ANY',
+    'vaapi': 'VIDEO_ACCELERATION_VAAPI',
+    'd3d11': 'VIDEO_ACCELERATION_D3D11',
+    'mfx': 'VIDEO_ACCELERATION_MFX',
+}
+
+
+def _capture_params(timeout_ms, hwaccel=None, threads=0):
+    """Paramètres d'ouverture VideoCapture: timeouts, threads de décodage et, si demandé et supporté, décodage matériel"""
+    params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(timeout_ms), cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(timeout_ms)]
+    if threads and hasattr(cv2, 'CAP_PROP_N_THREADS'):
+        # Doit être fixé à l'ouverture: le contexte du décodeur est créé dans le constructeur (OpenCV >= 4.7)
+        params += [cv2.CAP_PROP_N_THREADS, int(threads)]
+    accel = getattr(cv2, _CV_HWACCEL.get(hwaccel or '', ''), None)
+    if accel is not None and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+        params += [cv2.CAP_PROP_HW_ACCELERATION, accel]
+    return params
+
+
+def open_rtsp_capture(url, timeout_ms=3000, hwaccel=None, capture_class=None, threads=0):
+    """Ouvre un flux RTSP (FFMPEG) en appliquant les timeouts dès l'ouverture.
+    Les timeouts posés via cap.set() après construction n'ont aucun effet sur la connexion initiale:
+    ils doivent être passés au constructeur (OpenCV >= 4.5.2), sinon fallback sans paramètres.
+    """
+    if capture_class is not None:
+        return capture_class(url, timeout_ms=timeout_ms, hwaccel=hwaccel, threads=threads)
+    try:
+        return cv2.VideoCapture(url, cv2.CAP_FFMPEG, _capture_params(timeout_ms, hwaccel, threads))
+    except (TypeError, cv2.error):
+        return cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+
+
+def apply_fourcc(cap, fourcc):
+    """Force le codec de capture uniquement s'il est configuré explicitement (4 caractères, ex: MJPG)"""
+    if fourcc and len(fourcc) == 4:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+
+
+def reopen_rtsp_capture(cap, url, timeout_ms=3000, hwaccel=None, threads=0):
+    """Rouvre un flux RTSP sur un objet VideoCapture existant (open() libère l'ancien flux).
+    Retourne True si le flux est ouvert.
+    """
+    if not isinstance(cap, cv2.VideoCapture):
+        return cap.open(url, timeout_ms=timeout_ms, hwaccel=hwaccel, threads=threads)
+    try:
+        return bool(cap.open(url, cv2.CAP_FFMPEG, _capture_params(timeout_ms, hwaccel, threads)))
+    except (TypeError, cv2.error):
+        return bool(cap.open(url, cv2.CAP_FFMPEG))
+
+@lru_cache(maxsize=64)
+def _parse_and_validate_url(url):
+    """Validation complète (urlparse) mémorisée: les mêmes quelques URL sont revalidées à chaque démarrage"""
+    try:
+        parsed = urlparse(url)
+        if parsed.scheme not in ['rtsp', 'http', 'https']:
+            return False, "Protocol non supporté. Utilisez rtsp://, http:// ou https://"
+        
+        if not parsed.hostname:
+            return False, "Hostname manquant dans l'URL"
+        
+        return True, "URL valide"
+    except Exception as e:
+        return False, f"URL invalide: {str(e)}"
+
+# Nombre maximal de caméras RTSP configurables (DEFAULT_RTSP_URL .. DEFAULT_RTSP_URL_6)
+MAX_RTSP_CAMERAS = 6
+
+# Pool partagé pour les tests de connexion RTSP en arrière-plan (hors chemin critique des requêtes):
+# un worker par caméra possible, le rafraîchissement complet est borné par la sonde la plus lente
+_probe_pool = ThreadPoolExecutor(max_workers=MAX_RTSP_CAMERAS, thread_name_prefix='rtsp_probe')
+
 class CameraService:
     def __init__(self):
         # Support multi-caméra - dictionnaire des captures par camera_id
         self.captures = {}  # camera_id -> {'cap': VideoCapture, 'info': dict}
-        self.lock = threading.Lock()
+        # Protège uniquement les insertions/suppressions dans captures (les lectures ont un verrou par caméra)
+        self._registry_lock = threading.Lock()
         self.cameras_cache = None
-        self.cache_time = 0
+        self._cameras_by_id = {}  # camera_id -> entrée de cameras_cache
+        self.cache_time = 0  # time.monotonic() du dernier calcul
+        # Sérialise le recalcul et l'invalidation du cache; réentrant car un test RTSP déjà terminé
+        # rappelle _on_probe_done dans le thread qui recalcule
+        self._cache_lock = threading.RLock()
+        self._cache_generation = 0  # Incrémenté à chaque invalidation
         self.cache_duration = 30  # Cache pendant 30 secondes
+        # Cache des tests RTSP par URL: url -> (statut, expiration time.monotonic()); TTL selon le statut
+        self._probe_cache = {}
+        # Tests RTSP en cours en arrière-plan: url -> Future
+        self._probe_futures = {}
+        self._probe_lock = threading.Lock()
         
         # Optimisations IA
         self.motion_threshold = float(os.getenv('MOTION_THRESHOLD', '5.0'))  # Seuil de détection de mouvement %
         self.ai_image_quality = int(os.getenv('AI_IMAGE_QUALITY', '60'))    # Qualité JPEG pour l'IA (60%)
         self.ai_max_width = int(os.getenv('AI_MAX_WIDTH', '1280'))          # Largeur max pour l'IA
         self.ai_max_height = int(os.getenv('AI_MAX_HEIGHT', '720'))         # Hauteur max pour l'IA
-        self.frame_cache = {}  # camera_id -> {'last_hash': str, 'last_analysis_time': float}
+        self.frame_cache = {}  # camera_id -> {'last_hash': int, 'last_analysis_time': float}
+        # Distance de Hamming (sur 64 bits) en dessous de laquelle deux frames sont jugées quasi identiques
+        self.hash_max_distance = int(os.getenv('FRAME_HASH_MAX_DISTANCE', '5'))
         self.motion_detection_enabled = os.getenv('MOTION_DETECTION', 'true').lower() == 'true'
+        # Vidage adaptatif du buffer RTSP dans get_frame: au plus max_drain_frames grab() par lecture, arrêt dès
+        # qu'un grab() a attendu le réseau (voir _grab_was_buffered), signe que la frame la plus récente est atteinte
+        self.max_drain_frames = max(1, int(os.getenv('RTSP_MAX_DRAIN_FRAMES', '8')))
+        # Watchdog: délai sans frame fraîche avant reconnexion forcée (0 = désactivé)
+        self.stale_threshold = self._read_env_number('RTSP_STALE_THRESHOLD', 3.0, float)
+        # Redimensionnement OpenCL (T-API) des frames RTSP envoyées à l'IA (l'encodage JPEG reste sur CPU)
+        self.use_opencl = False
+        self._configure_opencl()
         
         load_dotenv()
+        # Signature du .env chargé: refresh_from_env ne recharge que si le fichier a changé
+        self._env_loaded_signature = self._env_signature()
+        # Backend de capture RTSP, lu après chargement du .env
+        self.capture_class = resolve_capture_class(os.getenv('RTSP_BACKEND', 'opencv'))
+        # Threads de décodage libavcodec par flux (0 = choix par défaut d'OpenCV/PyAV)
+        self.decode_threads = self._read_env_number('RTSP_DECODE_THREADS', 0)
         
         # Configuration RTSP - Support jusqu'à 6 caméras
-        self.default_rtsp_urls = []
-        for i in range(6):  # Support de 6 caméras maximum
-            url_key = f'DEFAULT_RTSP_URL_{i+1}' if i > 0 else 'DEFAULT_RTSP_URL'
-            username_key = f'RTSP_USERNAME_{i+1}' if i > 0 else 'RTSP_USERNAME' 
-            password_key = f'RTSP_PASSWORD_{i+1}' if i > 0 else 'RTSP_PASSWORD'
-            name_key = f'RTSP_NAME_{i+1}' if i > 0 else 'RTSP_NAME'
-            width_key = f'RTSP_WIDTH_{i+1}' if i > 0 else 'RTSP_WIDTH'
-            height_key = f'RTSP_HEIGHT_{i+1}' if i > 0 else 'RTSP_HEIGHT'
-            fps_key = f'RTSP_FPS_{i+1}' if i > 0 else 'RTSP_FPS'
-            
-            url = os.getenv(url_key, '')
+        self.default_rtsp_urls = self._load_rtsp_config()
+    
+    # Noms des variables d'environnement par caméra, calculés une seule fois:
+    # (url, username, password, name, width, height, fps, fourcc, hwaccel); suffixe _<n> à partir de la 2e caméra
+    _RTSP_ENV_KEYS = tuple(
+        tuple(f'{base}_{i+1}' if i > 0 else base for base in (
+            'DEFAULT_RTSP_URL', 'RTSP_USERNAME', 'RTSP_PASSWORD', 'RTSP_NAME',
+            'RTSP_WIDTH', 'RTSP_HEIGHT', 'RTSP_FPS', 'RTSP_FOURCC', 'RTSP_HWACCEL'))
+        for i in range(MAX_RTSP_CAMERAS)
+    )
+    
+    def _load_rtsp_config(self):
+        """Lit la configuration des caméras RTSP préconfigurées depuis l'environnement"""
+        configs = []
+        getenv = os.getenv
+        for i, (url_key, username_key, password_key, name_key, width_key, height_key, fps_key, fourcc_key, hwaccel_key) in enumerate(self._RTSP_ENV_KEYS):
+            url = getenv(url_key, '')
             if url:  # N'ajouter que si l'URL est définie
-                self.default_rtsp_urls.append({
-                    'name': os.getenv(name_key, f'RTSP Camera {i+1}'),
+                configs.append({
+                    'name': getenv(name_key, f'RTSP Camera {i+1}'),
                     'url': url,
-                    'username': os.getenv(username_key, ''),
-                    'password': os.getenv(password_key, ''),
-                    'width': int(os.getenv(width_key, '640')),  # Résolution réduite par défaut
-                    'height': int(os.getenv(height_key, '480')),
-                    'fps': int(os.getenv(fps_key, '15')),  # FPS réduit par défaut
+                    'username': getenv(username_key, ''),
+                    'password': getenv(password_key, ''),
+                    'width': int(getenv(width_key, '640')),  # Résolution réduite par défaut
+                    'height': int(getenv(height_key, '480')),
+                    'fps': int(getenv(fps_key, '15')),  # FPS réduit par défaut
+                    'fourcc': getenv(fourcc_key, '').strip(),  # Codec forcé (ex: MJPG), vide = codec natif du flux
+                    'hwaccel': getenv(hwaccel_key, '').strip().lower(),  # Décodage matériel (any/vaapi/d3d11/mfx, cuda avec PyAV)
                     'enabled': True
                 })
-        
-
+                # URL authentifiée calculée une fois au chargement (start_capture et reconnexions la réutilisent)
+                cfg = configs[-1]
+                cfg['resolved_url'] = self._with_credentials(cfg['url'], cfg['username'], cfg['password'])
+        return configs
     
     def get_available_cameras(self):
         """Récupère les caméras RTSP disponibles"""
-        if self.cameras_cache is not None and time.time() - self.cache_time < self.cache_duration:
-            return self.cameras_cache
-        
-        logger.info("=== Chargement des options RTSP ===")
-        
+        # Lecture sans verrou: le cache est publié par un seul remplacement de référence
+        cameras = self.cameras_cache
+        if cameras is not None and time.monotonic() - self.cache_time < self.cache_duration:
+            return cameras
+        
+        # Un seul thread recalcule; les autres attendent puis relisent le cache frais
+        with self._cache_lock:
+            cameras = self.cameras_cache
+            if cameras is not None and time.monotonic() - self.cache_time < self.cache_duration:
+                return cameras
+            return self._rebuild_cameras_cache()
+    
+    def _rebuild_cameras_cache(self):
+        """Recalcule la liste des caméras (appelée sous _cache_lock)"""
+        generation = self._cache_generation
         # Seules les caméras RTSP sont supportées
         cameras = self._get_rtsp_cameras()
         
-        logger.info(f"Options disponibles: {len(cameras)} source(s) RTSP configurée(s)")
-        for cam in cameras:
-            logger.info(f" - {cam['name']} (type: {cam['type']}, id: {cam['id']})")
-        logger.info("=== Fin du chargement des options ===")
+        # Un seul enregistrement de log pour toute l'énumération
+        if logger.isEnabledFor(logging.INFO):
+            lines = [f" - {cam['name']} (type: {cam['type']}, id: {cam['id']})" for cam in cameras]
+            logger.info("Options disponibles: %d source(s) RTSP configurée(s)\n%s", len(cameras), "\n".join(lines))
         
-        # Mettre en cache le résultat
+        # Invalidé pendant le calcul (résultat de test arrivé entre-temps): ne pas publier une liste périmée
+        if generation != self._cache_generation:
+            return cameras
+        
+        # Mettre en cache le résultat (liste ordonnée + index par id pour get_camera_info)
+        self._cameras_by_id = {str(cam['id']): cam for cam in cameras}
+        self.cache_time = time.monotonic()
         self.cameras_cache = cameras
-        self.cache_time = time.time()
         
         return cameras
     
-
+    def invalidate_cameras_cache(self, reprobe=False):
+        """Force le recalcul de la liste des caméras au prochain get_available_cameras.
+        reprobe=True (rafraîchissement demandé par l'utilisateur): expire aussi les tests RTSP, relancés
+        en arrière-plan; le dernier statut connu reste affiché jusqu'à leur résultat.
+        """
+        if reprobe:
+            for url, (status, _) in list(self._probe_cache.items()):
+                self._probe_cache[url] = (status, 0.0)
+        with self._cache_lock:
+            self._cache_generation += 1
+            self.cameras_cache = None
+            self.cache_time = 0
     
     def _get_rtsp_cameras(self):
         """Récupère les caméras RTSP configurées"""
         rtsp_cameras = []
         
         # Ajouter les URLs RTSP par défaut
-        for idx, rtsp_config in enumerate(self.default_rtsp_urls):
-            if rtsp_config['enabled']:
-                camera_name = f"RTSP Camera {idx + 1}"
-                if rtsp_config['name']:
-                    camera_name = rtsp_config['name']
-                
-                rtsp_cameras.append({
-                    'id': f'rtsp_{idx}',
-                    'name': camera_name,
-                    'type': 'rtsp',
-                    'url': rtsp_config['url'],
-                    'username': rtsp_config['username'],
-                    'password': rtsp_config['password'],
-                    'test_status': self._test_rtsp_connection(rtsp_config['url'])
-                })
+        enabled = [(idx, cfg) for idx, cfg in enumerate(self.default_rtsp_urls) if cfg['enabled']]
+        
+        # Statuts issus du cache; les tests manquants tournent en parallèle en arrière-plan ('pending')
+        for idx, rtsp_config in enabled:
+            test_status = self._get_cached_probe(rtsp_config['url'])
+            camera_name = f"RTSP Camera {idx + 1}"
+            if rtsp_config['name']:
+                camera_name = rtsp_config['name']
+            
+            rtsp_cameras.append({
+                'id': f'rtsp_{idx}',
+                'name': camera_name,
+                'type': 'rtsp',
+                'url': rtsp_config['url'],
+                'username': rtsp_config['username'],
+                'password': rtsp_config['password'],
+                'test_status': test_status
+            })
         
         # Ajouter l'option RTSP personnalisée
         rtsp_cameras.append({
@@ -111,51 +283,97 @@ class CameraService:
         
         return rtsp_cameras
     
+    # Durée de validité d'un test RTSP selon son résultat (les caméras en ligne sont re-testées rarement)
+    PROBE_TTLS = {'online': 300.0, 'offline': 30.0, 'error': 15.0, 'not_configured': float('inf')}
+
+    def _get_cached_probe(self, url):
+        """Statut RTSP d'une URL depuis le cache, sans bloquer.
+        Si l'entrée est absente ou expirée, un test est lancé en arrière-plan et le dernier
+        statut connu (ou 'pending') est retourné immédiatement.
+        """
+        now = time.monotonic()
+        cached = self._probe_cache.get(url)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        future = None
+        with self._probe_lock:
+            if url not in self._probe_futures:
+                future = _probe_pool.submit(self._test_rtsp_connection, url)
+                self._probe_futures[url] = future
+        if future is not None:
+            # Hors verrou: le callback peut s'exécuter immédiatement si le test est déjà terminé
+            future.add_done_callback(lambda f, url=url: self._on_probe_done(url, f))
+        return cached[0] if cached is not None else 'pending'
+
+    def _on_probe_done(self, url, future):
+        """Enregistre le résultat d'un test RTSP en arrière-plan et invalide la liste des caméras"""
+        try:
+            status = future.result()
+        except Exception:
+            status = 'error'
+        self._probe_cache[url] = (status, time.monotonic() + self.PROBE_TTLS.get(status, 15.0))
+        with self._probe_lock:
+            self._probe_futures.pop(url, None)
+        self.invalidate_cameras_cache()
+    
     def _test_rtsp_connection(self, url, timeout=3):
         """Test la connexion RTSP avec timeout réduit pour tests multiples"""
         if not url:
             return 'not_configured'
         
+        cap = None
         try:
-            # Timeout plus court pour éviter les blocages lors de tests multiples
-            cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+            # Timeout court (ouverture et lecture) pour éviter les blocages lors de tests multiples
+            cap = open_rtsp_capture(url, timeout_ms=timeout * 1000, capture_class=self.capture_class)
             cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-            # Définir un timeout court
-            cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout * 1000)
-            cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout * 1000)
             
             if cap.isOpened():
-                # Test de lecture rapide
-                ret, frame = cap.read()
-                cap.release()
-                return 'online' if ret and frame is not None else 'error'
-            else:
-                cap.release()
-                return 'offline'
+                # Test de lecture rapide: grab() suffit à prouver la réception d'une frame (pas de conversion BGR)
+                return 'online' if cap.grab() else 'error'
+            return 'offline'
         except Exception:
             return 'error'
+        finally:
+            if cap is not None:
+                try:
+                    cap.release()
+                except Exception:
+                    pass
+    
+    @staticmethod
+    def _with_credentials(url, username, password):
+        """Retourne l'URL avec les identifiants intégrés (si fournis)"""
+        if not (username and password):
+            return url
+        parsed = urlparse(url)
+        auth_netloc = f"{username}:{password}@{parsed.hostname}"
+        if parsed.port:
+            auth_netloc += f":{parsed.port}"
+        return urlunparse(parsed._replace(netloc=auth_netloc))
+
+    def _get_rtsp_config(self, source):
+        """Configuration d'une caméra préconfigurée ('rtsp_<index>') par accès direct, None sinon.
+        L'URL authentifiée ('resolved_url') est déjà calculée par _load_rtsp_config.
+        """
+        # Suffixe strictement numérique: int() accepterait '-1' (indexation depuis la fin), ' 1' ou '+1'
+        if not (isinstance(source, str) and source.startswith('rtsp_') and source[5:].isdigit()):
+            return None
+        try:
+            return self.default_rtsp_urls[int(source[5:])]
+        except (ValueError, IndexError):
+            return None
     
     def get_camera_info(self, camera_id):
         """Obtient des informations détaillées sur une caméra"""
-        cameras = self.get_available_cameras()
-        for camera in cameras:
-            if str(camera['id']) == str(camera_id):
-                return camera
-        return None
+        self.get_available_cameras()  # Rafraîchit le cache (et l'index) si expiré
+        return self._cameras_by_id.get(str(camera_id))
     
     def validate_rtsp_url(self, url):
         """Valide et normalise une URL RTSP"""
-        try:
-            parsed = urlparse(url)
-            if parsed.scheme not in ['rtsp', 'http', 'https']:
-                return False, "Protocol non supporté. Utilisez rtsp://, http:// ou https://"
-            
-            if not parsed.hostname:
-                return False, "Hostname manquant dans l'URL"
-            
-            return True, "URL valide"
-        except Exception as e:
-            return False, f"URL invalide: {str(e)}"
+        # Rejet rapide sans urlparse pour les URL sans schéma supporté (saisies invalides de l'UI)
+        if not url or not isinstance(url, str) or not url.lstrip()[:8].lower().startswith(('rtsp://', 'http://', 'https://')):
+            return False, "Protocol non supporté. Utilisez rtsp://, http:// ou https://"
+        return _parse_and_validate_url(url)
     
     def build_rtsp_url(self, ip, port=554, username='', password='', path=''):
         """Construit une URL RTSP à partir des composants"""
@@ -171,199 +389,167 @@ class CameraService:
     
     def start_capture(self, camera_id, source, source_type=None, rtsp_url=None):
         """Démarre la capture RTSP pour une caméra spécifique"""
-        with self.lock:
-            # Arrêter la capture existante pour cette caméra
-            if camera_id in self.captures:
-                self.stop_capture(camera_id)
+        # Arrêter la capture existante pour cette caméra (stop_capture prend lui-même le verrou du registre)
+        if camera_id in self.captures:
+            self.stop_capture(camera_id)
+        
+        try:
+            # Seul RTSP est supporté
+            source_type = 'rtsp'
+            logger.info(f"[{camera_id}] Démarrage de la capture RTSP - Source: {source}")
             
-            try:
-                # Seul RTSP est supporté
-                source_type = 'rtsp'
-                logger.info(f"[{camera_id}] Démarrage de la capture RTSP - Source: {source}")
+            if source_type == 'rtsp':
+                # Caméra RTSP
+                actual_url = rtsp_url if rtsp_url else source
                 
-                if source_type == 'rtsp':
-                    # Caméra RTSP
-                    actual_url = rtsp_url if rtsp_url else source
-                    
-                    # Gestion des caméras RTSP préconfigurées
-                    if isinstance(source, str) and source.startswith('rtsp_'):
-                        camera_info = self.get_camera_info(source)
-                        if camera_info and 'url' in camera_info:
-                            actual_url = camera_info['url']
-                            if camera_info.get('username') and camera_info.get('password'):
-                                # Construire l'URL avec authentification
-                                from urllib.parse import urlparse, urlunparse
-                                parsed = urlparse(actual_url)
-                                auth_netloc = f"{camera_info['username']}:{camera_info['password']}@{parsed.hostname}"
-                                if parsed.port:
-                                    auth_netloc += f":{parsed.port}"
-                                parsed = parsed._replace(netloc=auth_netloc)
-                                actual_url = urlunparse(parsed)
-                    
-                    logger.info(f"[{camera_id}] Ouverture du flux RTSP: {actual_url[:50]}...")
-                    
-                    # Configuration optimisée pour RTSP (FFMPEG)
-                    cap = cv2.VideoCapture(actual_url, cv2.CAP_FFMPEG)
-                    
-                    # Configuration RTSP spécifique pour latence minimale et performance
-                    if cap.isOpened():
-                        # Buffer minimal pour latence
-                        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                        
-                        # Optimisations de performance par caméra
-                        camera_info = self.get_camera_info(source) if isinstance(source, str) and source.startswith('rtsp_') else None
-                        if camera_info:
-                            # Appliquer résolution personnalisée si configurée
-                            if 'width' in camera_info and 'height' in camera_info:
-                                cap.set(cv2.CAP_PROP_FRAME_WIDTH, camera_info['width'])
-                                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, camera_info['height'])
-                            # Appliquer FPS personnalisé
-                            if 'fps' in camera_info:
-                                cap.set(cv2.CAP_PROP_FPS, camera_info['fps'])
-                        else:
-                            # Valeurs par défaut pour caméras personnalisées (optimisées pour performance)
-                            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                            cap.set(cv2.CAP_PROP_FPS, 15)
-                        
-                        # Optimisations RTSP supplémentaires
-                        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M','J','P','G'))
-                        # Timeout pour éviter les blocages
-                        cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 3000)
-                        cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, 3000)
-                        
-                        # Stocker les informations de la caméra
-                        self.captures[camera_id] = {
-                            'cap': cap,
-                            'source': source,
-                            'type': source_type,
-                            'url': actual_url,
-                            'last_frame_ts': 0.0,
-                            'reconnect_attempts': 0,
-                            'next_reconnect_time': 0.0,
-                            'last_frame': None,  # Pour détection de mouvement
-                            'motion_detected': True,  # Force première analyse
-                            'frame_count': 0,
-                            'last_motion_time': 0.0
-                        }
-                        
-                        logger.info(f"[{camera_id}] Capture RTSP démarrée avec succès")
-                        return True
-                    else:
-                        logger.error(f"[{camera_id}] Impossible d'ouvrir la source vidéo RTSP")
-                        cap.release()
-                        return False
-                
-            except Exception as e:
-                logger.exception(f"[{camera_id}] Erreur lors du démarrage de la capture: {e}")
-                return False
-                logger.info("Configuration des propriétés de la caméra RTSP")
-                
-                # Utiliser la résolution native de la source (ne pas forcer W/H)
-                # Conserver un buffer minimal pour réduire la latence
-                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # Gestion des caméras RTSP préconfigurées (URL authentifiée résolue une seule fois)
+                rtsp_config = self._get_rtsp_config(source)
+                if rtsp_config is not None:
+                    actual_url = rtsp_config['resolved_url']
                 
-                # Test de lecture avec plusieurs tentatives pour RTSP
-                max_attempts = 3
-                test_frame = None
+                logger.info(f"[{camera_id}] Ouverture du flux RTSP: {actual_url[:50]}...")
                 
-                for attempt in range(max_attempts):
-                    ret, test_frame = self.cap.read()
-                    if ret and test_frame is not None and test_frame.size > 0:
-                        break
-                    if attempt < max_attempts - 1:
-                        logger.warning(f"Tentative {attempt + 1} échouée, nouvelle tentative...")
-                        time.sleep(0.5)
+                # Configuration optimisée pour RTSP (FFMPEG), timeouts de 3s dès l'ouverture
+                hwaccel = rtsp_config['hwaccel'] if rtsp_config is not None else ''
+                cap = open_rtsp_capture(actual_url, timeout_ms=3000, hwaccel=hwaccel, capture_class=self.capture_class,
+                                        threads=self.decode_threads)
                 
-                if test_frame is None or test_frame.size == 0:
-                    logger.error("Impossible de lire une image depuis la caméra")
-                    self.cap.release()
-                    self.cap = None
-                    self.current_url = None
-                    return False
+                # Configuration RTSP spécifique pour latence minimale et performance
+                if cap.isOpened():
+                    # Buffer minimal pour latence
+                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                     
-                logger.info(f"Capture démarrée avec succès - Dimensions: {test_frame.shape}")
-                
-                self.current_source = rtsp_url if rtsp_url else source
-                self.current_type = source_type
-                self.is_capturing = True
-                self.last_frame_ts = time.time()
-                self.reconnect_attempts = 0
-                self.next_reconnect_time = 0.0
-                
-                return True
-                
-            except Exception as e:
-                logger.error(f"Erreur lors du démarrage de la capture: {e}")
-                if self.cap:
-                    self.cap.release()
-                    self.cap = None
-                self.current_url = None
-                return False
-    
+                    # Optimisations de performance par caméra
+                    if rtsp_config is not None:
+                        # Appliquer résolution et FPS configurés (RTSP_WIDTH/RTSP_HEIGHT/RTSP_FPS)
+                        cap.set(cv2.CAP_PROP_FRAME_WIDTH, rtsp_config['width'])
+                        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, rtsp_config['height'])
+                        cap.set(cv2.CAP_PROP_FPS, rtsp_config['fps'])
+                        apply_fourcc(cap, rtsp_config['fourcc'])
+                    else:
+                        # Valeurs par défaut pour caméras personnalisées (optimisées pour performance)
+                        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+                        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                        cap.set(cv2.CAP_PROP_FPS, 15)
+                    
+                    # Stocker les informations de la caméra (verrou propre à la caméra pour les lectures)
+                    entry = {
+                        'cap': cap,
+                        'lock': threading.Lock(),
+                        'source': source,
+                        'type': source_type,
+                        'url': actual_url,
+                        'fourcc': rtsp_config['fourcc'] if rtsp_config is not None else '',
+                        'hwaccel': hwaccel,
+                        'last_frame_ts': 0.0,
+                        'reconnect_attempts': 0,
+                        'next_reconnect_time': 0.0,  # time.monotonic()
+                        # Vidage du buffer: intervalle entre frames de la source et coût mesuré d'un grab() en tampon
+                        'frame_interval': self._frame_interval(cap),
+                        'decode_cost': 0.0,
+                        'motion_ref_gray': None,  # Référence 320x240 en niveaux de gris pour la détection de mouvement
+                        # Tampons réutilisés par small_gray (miniature BGR intermédiaire et miniature grise courante)
+                        'motion_bgr_buf': np.empty((240, 320, 3), dtype=np.uint8),
+                        'motion_gray_cur': np.empty((240, 320), dtype=np.uint8),
+                        'motion_detected': True,  # Force première analyse
+                        'frame_count': 0,
+                        'last_motion_time': 0.0,
+                        # Compteurs de diagnostic (écrits par le seul thread de décodage de la caméra, sans verrou)
+                        'stats': {
+                            'frames_delivered': 0,
+                            'frames_skipped': 0,
+                            'read_failures': 0,
+                            'reconnects': 0,
+                            'reconnect_failures': 0
+                        }
+                    }
+                    with self._registry_lock:
+                        self.captures[camera_id] = entry
+                    
+                    logger.info(f"[{camera_id}] Capture RTSP démarrée avec succès")
+                    return True
+                else:
+                    logger.error(f"[{camera_id}] Impossible d'ouvrir la source vidéo RTSP")
+                    cap.release()
+                    return False
+            
+        except Exception as e:
+            logger.exception(f"[{camera_id}] Erreur lors du démarrage de la capture: {e}")
+            return False
+
     def stop_capture(self, camera_id=None):
         """Arrête la capture pour une caméra spécifique ou toutes les caméras"""
-        with self.lock:
+        with self._registry_lock:
             if camera_id:
                 # Arrêter une caméra spécifique
-                if camera_id in self.captures:
+                entry = self.captures.pop(camera_id, None)
+                entries = [entry] if entry is not None else []
+                if entries:
                     logger.info(f"[{camera_id}] Arrêt de la capture RTSP")
-                    camera_info = self.captures[camera_id]
-                    if camera_info['cap']:
-                        camera_info['cap'].release()
-                    del self.captures[camera_id]
             else:
                 # Arrêter toutes les caméras
                 logger.info("Arrêt de toutes les captures RTSP")
-                for cam_id, camera_info in self.captures.items():
-                    if camera_info['cap']:
-                        camera_info['cap'].release()
+                entries = list(self.captures.values())
                 self.captures.clear()
+        # Libération hors verrou du registre; le verrou de la caméra attend la fin d'une lecture en cours
+        for camera_info in entries:
+            with camera_info['lock']:
+                if camera_info['cap']:
+                    camera_info['cap'].release()
+                camera_info['cap'] = None
     
     def get_frame(self, camera_id):
         """Récupère une image de la caméra spécifique avec gestion améliorée"""
-        with self.lock:
-            if camera_id not in self.captures:
-                return None
-            
-            camera_info = self.captures[camera_id]
+        # Lecture sans verrou global: seul le verrou de la caméra sérialise ses lectures
+        camera_info = self.captures.get(camera_id)
+        if camera_info is None:
+            return None
+        with camera_info['lock']:
             cap = camera_info['cap']
             
             if not cap:
-                now = time.time()
+                now = time.monotonic()
                 if now >= camera_info['next_reconnect_time']:
                     logger.warning(f"[{camera_id}] Capteur RTSP absent, tentative de reconnexion...")
-                    return self._reconnect_camera(camera_id)
+                    return self._reconnect_camera(camera_id, camera_info)
                 return None
                 
             try:
                 # Si le flux est fermé, tenter une reconnexion (respecter la fenêtre)
                 if not cap.isOpened():
-                    now = time.time()
+                    now = time.monotonic()
                     if now >= camera_info['next_reconnect_time']:
                         logger.warning(f"[{camera_id}] Capteur RTSP fermé, tentative de reconnexion immédiate...")
-                        return self._reconnect_camera(camera_id)
+                        return self._reconnect_camera(camera_id, camera_info)
                     return None
 
                 # Watchdog: si aucune frame fraîche depuis trop longtemps, forcer une reconnexion
-                stale_threshold = float(os.getenv('RTSP_STALE_THRESHOLD', '3.0'))
+                stale_threshold = self.stale_threshold
                 if camera_info['last_frame_ts'] and stale_threshold > 0 and (time.time() - camera_info['last_frame_ts']) > stale_threshold:
-                    now = time.time()
+                    now = time.monotonic()
                     if now >= camera_info['next_reconnect_time']:
                         logger.warning(f"[{camera_id}] Aucune frame récente depuis {time.time() - camera_info['last_frame_ts']:.1f}s, tentative de reconnexion...")
-                        return self._reconnect_camera(camera_id)
+                        return self._reconnect_camera(camera_id, camera_info)
 
-                # Pour RTSP, lire la frame la plus récente (skip des frames en buffer)
-                ret = False
+                # Pour RTSP, lire la frame la plus récente: grab() tant que les frames sortent du buffer sans attente
+                # (borné par max_drain_frames), retrieve() (conversion BGR) uniquement sur la dernière frame.
+                # L'appelant (decode_loop côté app) est un thread producteur dédié: les requêtes HTTP ne lisent jamais ici.
+                # En régime normal le buffer est vide: le premier grab() attend la frame suivante et elle est retenue.
                 frame = None
-                # Lire plusieurs frames pour vider le buffer et obtenir la plus récente
-                skip_frames = 2  # Réduire le nombre de frames à skip pour économiser CPU
-                for _ in range(skip_frames):
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
+                t0 = time.perf_counter()
+                ret = cap.grab()
+                drained = 1
+                while ret and drained < self.max_drain_frames and self._grab_was_buffered(camera_info, time.perf_counter() - t0):
+                    t0 = time.perf_counter()
+                    ret = cap.grab()
+                    drained += 1
+                if ret:
+                    ret, frame = cap.retrieve()
+                stats = camera_info['stats']
 
                 if ret and frame is not None and frame.size > 0:
+                    stats['frames_delivered'] += 1
+                    stats['frames_skipped'] += drained - 1
                     camera_info['last_frame_ts'] = time.time()
                     # reset compteur de reconnexion sur succès
                     camera_info['reconnect_attempts'] = 0
@@ -374,6 +560,7 @@ class CameraService:
                     return frame
                 else:
                     # Plusieurs tentatives avec délai
+                    stats['read_failures'] += 1
                     logger.warning(f"[{camera_id}] Échec de lecture de frame")
                     return None
                     
@@ -381,151 +568,232 @@ class CameraService:
                 logger.exception(f"[{camera_id}] Erreur lors de la lecture: {e}")
                 return None
     
-    def _reconnect_camera(self, camera_id):
-        """Tente de reconnecter la caméra avec backoff exponentiel et URL exacte"""
-        if camera_id not in self.captures:
+    @staticmethod
+    def _frame_interval(cap):
+        """Intervalle entre frames annoncé par la source (s), 0.0 si inconnu ou aberrant"""
+        try:
+            fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        except Exception:
+            fps = 0.0
+        return 1.0 / fps if 1.0 <= fps <= 120.0 else 0.0
+    
+    @staticmethod
+    def _grab_was_buffered(camera_info, elapsed):
+        """True si le grab() (durée `elapsed`) a rendu une frame déjà en tampon, False s'il a attendu le réseau.
+        Seuil: 2x le coût de décodage mesuré (moyenne glissante des grab() en tampon), borné à une
+        demi-période de la source: au-delà, le grab() a forcément attendu l'arrivée d'une nouvelle frame.
+        """
+        half_interval = 0.5 * (camera_info['frame_interval'] or 0.04)
+        cost = camera_info['decode_cost']
+        cutoff = min(half_interval, 2.0 * cost + 0.001) if cost > 0.0 else half_interval
+        if elapsed > cutoff:
+            return False
+        camera_info['decode_cost'] = elapsed if cost <= 0.0 else 0.8 * cost + 0.2 * elapsed
+        return True
+    
+    # Nombre de fenêtres de reconnexion échouées consécutives avant de ne plus faire qu'une sonde par fenêtre
+    RECONNECT_CIRCUIT_THRESHOLD = 3
+    
+    @staticmethod
+    def _schedule_reconnect(camera_info):
+        """Programme la prochaine fenêtre de reconnexion: backoff exponentiel (max 30s) avec jitter,
+        pour que les caméras coupées ensemble ne se reconnectent pas toutes au même instant.
+        Retourne le délai choisi (s).
+        """
+        camera_info['reconnect_attempts'] += 1
+        camera_info['stats']['reconnect_failures'] += 1
+        backoff = min(2 ** camera_info['reconnect_attempts'], 30)
+        delay = random.uniform(backoff / 2, backoff)
+        camera_info['next_reconnect_time'] = time.monotonic() + delay
+        return delay
+    
+    def _reconnect_camera(self, camera_id, camera_info):
+        """Tente de reconnecter la caméra avec backoff exponentiel et URL exacte.
+        Appelée depuis get_frame avec le verrou de la caméra (camera_info['lock']) déjà acquis.
+        """
+        if self.captures.get(camera_id) is not camera_info:
+            # Capture arrêtée ou remplacée entre-temps
             return None
-            
-        camera_info = self.captures[camera_id]
         
         try:
-            # Fermer la connexion actuelle
-            if camera_info['cap']:
-                try:
-                    camera_info['cap'].release()
-                except Exception:
-                    pass
+            # Réutiliser l'objet VideoCapture existant: open() ferme l'ancien flux lui-même
+            cap = camera_info['cap'] or new_rtsp_capture(self.capture_class)
             
-            max_tries = 3
+            # Circuit ouvert (source hors ligne depuis plusieurs fenêtres): une seule sonde au lieu de 3 essais
+            circuit_open = camera_info['reconnect_attempts'] >= self.RECONNECT_CIRCUIT_THRESHOLD
+            max_tries = 1 if circuit_open else 3
             last_err = None
             for i in range(max_tries):
                 logger.info(f"[{camera_id}] 🔄 Reconnexion RTSP (tentative {i+1}/{max_tries}) vers {str(camera_info['url'])[:50]}...")
-                cap = cv2.VideoCapture(camera_info['url'], cv2.CAP_FFMPEG)
-                if cap and cap.isOpened():
+                if reopen_rtsp_capture(cap, camera_info['url'], timeout_ms=3000, hwaccel=camera_info.get('hwaccel'),
+                                       threads=self.decode_threads):
                     # Configurer: latence minimale sans forcer la résolution
                     cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M','J','P','G'))
+                    apply_fourcc(cap, camera_info.get('fourcc'))
                     # Lire une image
                     ret, frame = cap.read()
                     if ret and frame is not None and frame.size > 0:
                         camera_info['cap'] = cap
+                        camera_info['frame_interval'] = self._frame_interval(cap)
                         camera_info['last_frame_ts'] = time.time()
                         camera_info['reconnect_attempts'] = 0
                         camera_info['next_reconnect_time'] = 0.0
+                        camera_info['stats']['reconnects'] += 1
                         logger.info(f"[{camera_id}] ✅ Caméra RTSP reconnectée avec succès")
                         return frame
-                    else:
-                        last_err = "read_failed"
-                        cap.release()
+                    last_err = "read_failed"
                 else:
                     last_err = "open_failed"
-                    if cap:
-                        try:
-                            cap.release()
-                        except Exception:
-                            pass
-                time.sleep(0.5)
+                if i + 1 < max_tries:
+                    time.sleep(0.5)
+            
+            # Libérer le flux FFMPEG mais conserver l'objet pour la prochaine fenêtre de reconnexion
+            try:
+                cap.release()
+            except Exception:
+                pass
+            camera_info['cap'] = cap
             
             # Échec: programmer prochaine fenêtre de tentative
-            camera_info['reconnect_attempts'] += 1
-            backoff = min(2 ** camera_info['reconnect_attempts'], 30)
-            camera_info['next_reconnect_time'] = time.time() + backoff
+            backoff = self._schedule_reconnect(camera_info)
             logger.error(f"[{camera_id}] ❌ Impossible de reconnecter la caméra (err={last_err}). Nouvelle tentative dans {backoff:.0f}s")
-            # S'assurer que cap sera réouvert proprement à la prochaine tentative
-            camera_info['cap'] = None
             return None
         except Exception as e:
-            self.reconnect_attempts += 1
-            backoff = min(2 ** self.reconnect_attempts, 30)
-            self.next_reconnect_time = time.time() + backoff
-            logger.exception(f"Erreur lors de la reconnexion: {e}. Nouvelle tentative dans {backoff:.0f}s")
-            self.cap = None
+            backoff = self._schedule_reconnect(camera_info)
+            logger.exception(f"[{camera_id}] Erreur lors de la reconnexion: {e}. Nouvelle tentative dans {backoff:.0f}s")
+            camera_info['cap'] = None
             return None
     
-    def is_active(self):
-        """Vérifie si la capture est active"""
-        return self.is_capturing
+    def get_stats(self, camera_id=None):
+        """Copie des compteurs de capture (une caméra, ou toutes: camera_id -> compteurs)"""
+        if camera_id is not None:
+            camera_info = self.captures.get(camera_id)
+            return {**camera_info['stats'], 'last_frame_ts': camera_info['last_frame_ts']} if camera_info is not None else None
+        return {cid: {**info['stats'], 'last_frame_ts': info['last_frame_ts']} for cid, info in list(self.captures.items())}
+    
+    def is_active(self, camera_id=None):
+        """Vérifie si la capture est active (pour une caméra donnée ou au moins une)"""
+        if camera_id is not None:
+            return camera_id in self.captures
+        return bool(self.captures)
 
-    def get_source_fps(self, camera_id):
-        """Retourne le FPS de la source si disponible, sinon None"""
-        try:
-            if camera_id in self.captures:
-                camera_info = self.captures[camera_id]
-                cap = camera_info['cap']
-                if cap and cap.isOpened():
-                    fps = cap.get(cv2.CAP_PROP_FPS)
-                    if fps and fps > 0 and fps < 240:
-                        return fps
-        except Exception:
-            pass
-        return None
+    def active_camera_ids(self):
+        """Instantané (set) des caméras dont la capture est ouverte"""
+        return set(self.captures)
 
     def refresh_from_env(self):
         """Recharge les paramètres RTSP depuis le fichier .env et invalide le cache.
         N'arrête pas une capture en cours; les nouveaux réglages seront utilisés pour les prochaines actions.
+        Retourne False (sans rien recharger) si le .env n'a pas changé depuis le dernier chargement.
         """
+        # .env inchangé depuis le dernier chargement: conserver configuration et résultats de tests RTSP
+        signature = self._env_signature()
+        if signature is not None and signature == self._env_loaded_signature:
+            logger.debug("CameraService: .env inchangé, rechargement ignoré")
+            return False
+        self._env_loaded_signature = signature
         try:
             load_dotenv(override=True)
         except Exception:
             # Même sans dotenv, continuer avec os.environ
             pass
+        self.stale_threshold = self._read_env_number('RTSP_STALE_THRESHOLD', 3.0, float)
+        # Nouveau backend appliqué aux prochaines ouvertures (les captures en cours gardent le leur)
+        self.capture_class = resolve_capture_class(os.getenv('RTSP_BACKEND', 'opencv'))
+        self.decode_threads = self._read_env_number('RTSP_DECODE_THREADS', 0)
+        self._configure_opencl()
         # Recharger la configuration RTSP multi-caméras
-        self.default_rtsp_urls = []
-        for i in range(6):  # Support de 6 caméras maximum
-            url_key = f'DEFAULT_RTSP_URL_{i+1}' if i > 0 else 'DEFAULT_RTSP_URL'
-            username_key = f'RTSP_USERNAME_{i+1}' if i > 0 else 'RTSP_USERNAME' 
-            password_key = f'RTSP_PASSWORD_{i+1}' if i > 0 else 'RTSP_PASSWORD'
-            name_key = f'RTSP_NAME_{i+1}' if i > 0 else 'RTSP_NAME'
-            width_key = f'RTSP_WIDTH_{i+1}' if i > 0 else 'RTSP_WIDTH'
-            height_key = f'RTSP_HEIGHT_{i+1}' if i > 0 else 'RTSP_HEIGHT'
-            fps_key = f'RTSP_FPS_{i+1}' if i > 0 else 'RTSP_FPS'
-            
-            url = os.getenv(url_key, '')
-            if url:  # N'ajouter que si l'URL est définie
-                self.default_rtsp_urls.append({
-                    'name': os.getenv(name_key, f'RTSP Camera {i+1}'),
-                    'url': url,
-                    'username': os.getenv(username_key, ''),
-                    'password': os.getenv(password_key, ''),
-                    'width': int(os.getenv(width_key, '640')),
-                    'height': int(os.getenv(height_key, '480')),
-                    'fps': int(os.getenv(fps_key, '15')),
-                    'enabled': True
-                })
+        self.default_rtsp_urls = self._load_rtsp_config()
         # Invalider le cache des caméras pour forcer le recalcul
-        self.cameras_cache = None
-        self.cache_time = 0
+        self._probe_cache.clear()
+        self.invalidate_cameras_cache()
         logger.info("🔄 CameraService: configuration RTSP rechargée depuis .env (cache invalidé)")
+        return True
+
+    def _configure_opencl(self):
+        """Active le redimensionnement OpenCL si AI_USE_OPENCL=true et qu'un périphérique OpenCL est présent"""
+        wanted = os.getenv('AI_USE_OPENCL', 'false').lower() == 'true'
+        enabled = False
+        try:
+            if wanted:
+                enabled = cv2.ocl.haveOpenCL()
+            if enabled or self.use_opencl:
+                cv2.ocl.setUseOpenCL(enabled)
+        except Exception:
+            enabled = False
+        if wanted:
+            logger.info(f"Redimensionnement OpenCL pour l'IA: {'activé' if enabled else 'indisponible'}")
+        self.use_opencl = enabled
 
-    def detect_motion(self, camera_id, current_frame):
-        """Détecte le mouvement entre la frame actuelle et la précédente"""
+    @staticmethod
+    def _read_env_number(name, default, cast=int):
+        """Variable numérique (>= 0) validée: une valeur invalide est ignorée (défaut) au lieu d'empêcher
+        le démarrage ou d'interrompre un rechargement à chaud
+        """
+        raw = os.getenv(name)
+        if raw is None or not raw.strip():
+            return default
+        try:
+            return max(0, cast(raw))
+        except ValueError:
+            logger.warning(f"{name} invalide ({raw!r}): valeur {default} utilisée")
+            return default
+
+    @staticmethod
+    def _env_signature(path='.env'):
+        """(mtime_ns, taille) du fichier .env, None s'il est absent"""
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    @staticmethod
+    def small_gray(frame, bgr_buf=None, gray_buf=None):
+        """Miniature 320x240 en niveaux de gris partagée par la détection de mouvement et le hash perceptuel.
+        INTER_NEAREST: simple échantillonnage, suffisant pour un seuil de différence et bien plus rapide.
+        `bgr_buf`/`gray_buf`: tampons préalloués écrits sur place (pas d'allocation par frame).
+        """
+        small = cv2.resize(frame, (320, 240), dst=bgr_buf, interpolation=cv2.INTER_NEAREST)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=gray_buf)
+    
+    @staticmethod
+    def _set_motion_ref(camera_info, gray):
+        """Fait de `gray` la référence de mouvement. Si c'est le tampon courant de la caméra, les tampons
+        sont échangés (l'ancienne référence sera réécrite à la prochaine frame) au lieu d'être copiés.
+        """
+        if gray is camera_info.get('motion_gray_cur'):
+            old_ref = camera_info.get('motion_ref_gray')
+            camera_info['motion_gray_cur'] = old_ref if old_ref is not None else np.empty_like(gray)
+        camera_info['motion_ref_gray'] = gray
+    
+    def detect_motion(self, camera_id, current_frame, gray_small=None):
+        """Détecte le mouvement entre la frame actuelle et la précédente.
+        `gray_small` (résultat de small_gray) évite de recalculer la miniature si l'appelant l'a déjà.
+        """
         if not self.motion_detection_enabled or camera_id not in self.captures:
             return True  # Si désactivé, considérer qu'il y a toujours du mouvement
         
         camera_info = self.captures[camera_id]
-        last_frame = camera_info.get('last_frame')
-        
-        if last_frame is None:
-            # Première frame, sauvegarder et considérer qu'il y a mouvement
-            camera_info['last_frame'] = current_frame.copy()
-            camera_info['motion_detected'] = True
-            return True
         
         try:
-            # Redimensionner pour accélérer la détection de mouvement
-            small_current = cv2.resize(current_frame, (320, 240))
-            small_last = cv2.resize(last_frame, (320, 240))
+            # Une seule réduction + conversion en niveaux de gris pour la frame courante;
+            # la référence est conservée déjà réduite en gris (pas de copie BGR pleine résolution)
+            gray_current = gray_small if gray_small is not None else self.small_gray(current_frame)
+            gray_last = camera_info.get('motion_ref_gray')
             
-            # Convertir en niveaux de gris
-            gray_current = cv2.cvtColor(small_current, cv2.COLOR_BGR2GRAY)
-            gray_last = cv2.cvtColor(small_last, cv2.COLOR_BGR2GRAY)
+            if gray_last is None:
+                # Première frame, sauvegarder et considérer qu'il y a mouvement
+                self._set_motion_ref(camera_info, gray_current)
+                camera_info['motion_detected'] = True
+                return True
             
             # Calculer la différence
             diff = cv2.absdiff(gray_current, gray_last)
             
-            # Calculer le pourcentage de pixels qui ont changé
+            # Calculer le pourcentage de pixels qui ont changé (seuillage + comptage SIMD dans OpenCV)
             total_pixels = diff.shape[0] * diff.shape[1]
-            changed_pixels = np.count_nonzero(diff > 30)  # Seuil de changement
+            changed_pixels = cv2.countNonZero(cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)[1])  # Seuil de changement
             motion_percentage = (changed_pixels / total_pixels) * 100
             
             has_motion = motion_percentage > self.motion_threshold
@@ -540,7 +808,7 @@ class CameraService:
             # Mettre à jour la frame de référence périodiquement
             camera_info['frame_count'] += 1
             if camera_info['frame_count'] % 30 == 0:  # Toutes les 30 frames
-                camera_info['last_frame'] = current_frame.copy()
+                self._set_motion_ref(camera_info, gray_current)
             
             return has_motion
             
@@ -584,6 +852,9 @@ class CameraService:
             # Redimensionner intelligemment si nécessaire
             height, width = frame.shape[:2]
             if width > self.ai_max_width or height > self.ai_max_height:
+                if self.use_opencl:
+                    # Redimensionnement OpenCL (T-API) uniquement: la frame est rapatriée (get) avant l'encodage CPU
+                    frame = cv2.UMat(frame)
                 # Calculer le ratio de redimensionnement en gardant l'aspect ratio
                 scale_w = self.ai_max_width / width
                 scale_h = self.ai_max_height / height
@@ -594,11 +865,12 @@ class CameraService:
                 frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
                 logger.debug(f"[{camera_id}] Frame redimensionnée: {width}x{height} -> {new_width}x{new_height}")
             
-            # Encoder avec qualité réduite pour économiser la bande passante
-            encode_params = [cv2.IMWRITE_JPEG_QUALITY, self.ai_image_quality]
-            _, buffer = cv2.imencode('.jpg', frame, encode_params)
+            if isinstance(frame, cv2.UMat):
+                # Les encodeurs libjpeg-turbo / nvJPEG travaillent sur des tableaux numpy
+                frame = frame.get()
             
-            return buffer
+            # Encoder avec qualité réduite pour économiser la bande passante (backend le plus rapide disponible)
+            return encode_jpeg(frame, quality=self.ai_image_quality)
             
         except Exception as e:
             logger.warning(f"[{camera_id}] Erreur optimisation frame: {e}")
@@ -606,23 +878,25 @@ class CameraService:
             _, buffer = cv2.imencode('.jpg', frame)
             return buffer
     
-    def get_frame_hash(self, frame):
-        """Calcule un hash rapide d'une frame pour détecter les images identiques"""
+    def get_frame_hash(self, frame, gray_small=None):
+        """Calcule un hash perceptuel (dHash 64 bits) d'une frame: robuste au bruit de compression RTSP,
+        comparable par distance de Hamming. Retourne un int, ou None en cas d'échec.
+        Avec `gray_small` (miniature de small_gray), la frame pleine résolution n'est pas reparcourue.
+        """
         try:
-            # Redimensionner à une petite taille pour le hash
-            small_frame = cv2.resize(frame, (64, 64))
-            # Convertir en niveaux de gris
-            gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
-            # Calculer le hash
-            frame_hash = hashlib.md5(gray.tobytes()).hexdigest()
-            return frame_hash
+            # 9x8 en niveaux de gris: chaque bit compare deux pixels horizontalement adjacents
+            if gray_small is not None:
+                gray = cv2.resize(gray_small, (9, 8), interpolation=cv2.INTER_AREA)
+            else:
+                gray = cv2.cvtColor(cv2.resize(frame, (9, 8), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+            return int.from_bytes(np.packbits(gray[:, 1:] > gray[:, :-1]).tobytes(), 'big')
         except Exception:
             return None
     
-    def is_frame_significantly_different(self, camera_id, frame):
+    def is_frame_significantly_different(self, camera_id, frame, gray_small=None):
         """Vérifie si la frame est significativement différente de la précédente analysée"""
-        frame_hash = self.get_frame_hash(frame)
-        if not frame_hash:
+        frame_hash = self.get_frame_hash(frame, gray_small)
+        if frame_hash is None:
             return True  # Si on ne peut pas calculer le hash, analyser par sécurité
         
         cache_key = f"last_analysis_{camera_id}"
@@ -630,8 +904,8 @@ class CameraService:
             self.frame_cache[cache_key] = {}
         
         last_hash = self.frame_cache[cache_key].get('last_hash')
-        if last_hash and last_hash == frame_hash:
-            logger.debug(f"[{camera_id}] Frame identique à la précédente, analyse skippée")
+        if last_hash is not None and (last_hash ^ frame_hash).bit_count() < self.hash_max_distance:
+            logger.debug(f"[{camera_id}] Frame quasi identique à la précédente, analyse skippée")
             return False
         
         # Sauvegarder le nouveau hash
@@ -640,14 +914,27 @@ class CameraService:
         
         return True
     
-    def get_optimized_frame_for_ai(self, camera_id):
-        """Récupère et optimise une frame pour l'analyse IA avec tous les filtres d'optimisation"""
-        frame = self.get_frame(camera_id)
+    def get_optimized_frame_for_ai(self, camera_id, frame=None):
+        """Récupère et optimise une frame pour l'analyse IA avec tous les filtres d'optimisation.
+        Si `frame` est fournie (déjà lue par l'appelant), aucune lecture supplémentaire n'est faite.
+        """
+        if frame is None:
+            frame = self.get_frame(camera_id)
         if frame is None:
             return None
         
+        # Miniature grise calculée une seule fois pour la détection de mouvement et le hash
+        camera_info = self.captures.get(camera_id)
+        try:
+            if camera_info is not None:
+                gray_small = self.small_gray(frame, camera_info['motion_bgr_buf'], camera_info['motion_gray_cur'])
+            else:
+                gray_small = self.small_gray(frame)
+        except Exception:
+            gray_small = None
+        
         # 1. Détection de mouvement
-        if self.motion_detection_enabled and not self.detect_motion(camera_id, frame):
+        if self.motion_detection_enabled and not self.detect_motion(camera_id, frame, gray_small):
             logger.debug(f"[{camera_id}] Pas de mouvement détecté, analyse skippée")
             return None
         
@@ -657,7 +944,7 @@ class CameraService:
             return None
         
         # 3. Vérifier si la frame est différente de la précédente
-        if not self.is_frame_significantly_different(camera_id, frame):
+        if not self.is_frame_significantly_different(camera_id, frame, gray_small):
             return None
         
         # 4. Optimiser la frame pour l'IA
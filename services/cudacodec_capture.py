@@ -0,0 +1,102 @@
+import logging
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+def cudacodec_available():
+    """True si OpenCV est compilé avec cudacodec et qu'un GPU CUDA est présent"""
+    try:
+        return hasattr(cv2, 'cudacodec') and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:
+        return False
+
+
+class CudaCodecCapture:
+    """Capture RTSP décodée par NVDEC (cv2.cudacodec.VideoReader) exposant l'interface de cv2.VideoCapture
+    utilisée par CameraService. grab() reste sur le GPU; retrieve() convertit en BGR sur le GPU puis
+    rapatrie uniquement la frame conservée.
+    """
+
+    def __init__(self, url=None, timeout_ms=3000, **_):
+        self._reader = None
+        if url:
+            self.open(url, timeout_ms=timeout_ms)
+
+    def open(self, url, timeout_ms=3000, **_):
+        """Ouvre (ou rouvre) le flux; les options hwaccel/threads ne s'appliquent pas (décodage NVDEC)"""
+        self.release()
+        source_params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(timeout_ms), cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(timeout_ms)]
+        try:
+            try:
+                self._reader = cv2.cudacodec.createVideoReader(url, sourceParams=source_params)
+            except (TypeError, cv2.error):
+                self._reader = cv2.cudacodec.createVideoReader(url)
+            # Sortie BGR directe si supportée (OpenCV >= 4.7), sinon BGRA converti dans retrieve()
+            try:
+                self._reader.set(cv2.cudacodec.ColorFormat_BGR)
+            except Exception:
+                pass
+            return True
+        except Exception as e:
+            logger.debug(f"cudacodec: ouverture impossible de {str(url)[:50]}: {e}")
+            self._reader = None
+            return False
+
+    def isOpened(self):
+        return self._reader is not None
+
+    def grab(self):
+        if self._reader is None:
+            return False
+        try:
+            if self._reader.grab():
+                return True
+        except cv2.error as e:
+            logger.debug(f"cudacodec: lecture interrompue: {e}")
+        # Fin de flux ou erreur réseau: fermer pour déclencher la reconnexion
+        self.release()
+        return False
+
+    def retrieve(self):
+        if self._reader is None:
+            return False, None
+        try:
+            ok, gpu_frame = self._reader.retrieve()
+            if not ok or gpu_frame is None or gpu_frame.empty():
+                return False, None
+            if gpu_frame.channels() == 4:
+                gpu_frame = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGRA2BGR)
+            return True, gpu_frame.download()
+        except cv2.error as e:
+            logger.debug(f"cudacodec: conversion impossible: {e}")
+            return False, None
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop):
+        if self._reader is None:
+            return 0.0
+        try:
+            fmt = self._reader.format()
+            if prop == cv2.CAP_PROP_FPS:
+                return float(fmt.fps or 0.0)
+            if prop == cv2.CAP_PROP_FRAME_WIDTH:
+                return float(fmt.width)
+            if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+                return float(fmt.height)
+        except Exception:
+            pass
+        return 0.0
+
+    def set(self, prop, value):
+        # Résolution/FPS/tampon imposés par la caméra
+        return False
+
+    def release(self):
+        # Le VideoReader libère le décodeur NVDEC et la connexion à sa destruction
+        self._reader = None
@@ -59,10 +59,13 @@ class HAService:
             if frame is None:
                 return None
             # Vérifier si déjà en 720p pour éviter un redimensionnement inutile
-            height, width = frame.shape[:2]
-            if height == 720 and width == 1280:
+            shape = frame.shape
+            if shape[0] == 720 and shape[1] == 1280:
                 return frame
-            return cv2.resize(frame, (1280, 720), interpolation=cv2.INTER_AREA)
+            # Forte réduction (>=2x, ex: 4K): INTER_AREA (chemin entier SIMD), sinon interpolation linéaire
+            if shape[0] >= 1440 and shape[1] >= 2560:
+                return cv2.resize(frame, (1280, 720), interpolation=cv2.INTER_AREA)
+            return cv2.resize(frame, (1280, 720), interpolation=cv2.INTER_LINEAR)
         except Exception as e:
             self.logger.warning(f"Erreur lors du redimensionnement: {e}")
             return frame
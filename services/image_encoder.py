@@ -0,0 +1,91 @@
+import logging
+import os
+import threading
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Backends JPEG initialisés au premier encodage (après chargement du .env), voir _init_backends
+_nvj = None
+_tj = None
+_sj = None
+TJPF_BGR = TJSAMP_420 = None
+_backends_ready = False
+_backends_lock = threading.Lock()
+
+
+def _init_backends():
+    """Sélectionne les backends selon JPEG_ENCODER: 'auto' (défaut) | 'nvjpeg' | 'turbojpeg' | 'simplejpeg' | 'opencv'"""
+    global _nvj, _tj, _sj, TJPF_BGR, TJSAMP_420, _backends_ready
+    with _backends_lock:
+        if _backends_ready:
+            return
+        encoder_pref = os.getenv('JPEG_ENCODER', 'auto').lower()
+
+        # nvJPEG (GPU NVIDIA via pynvjpeg): décharge complètement l'encodage du CPU
+        if encoder_pref in ('auto', 'nvjpeg'):
+            try:
+                from nvjpeg import NvJpeg
+                _nvj = NvJpeg()
+                logger.info("Encodage JPEG: backend GPU nvJPEG")
+            except Exception:
+                _nvj = None
+
+        # libjpeg-turbo (PyTurboJPEG) si disponible: DCT/conversion couleur SIMD, ~2-4x plus rapide que cv2.imencode
+        if encoder_pref in ('auto', 'nvjpeg', 'turbojpeg'):
+            try:
+                from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+                _tj = TurboJPEG()
+                if _nvj is None:
+                    logger.info("Encodage JPEG: backend libjpeg-turbo (PyTurboJPEG)")
+            except Exception:
+                _tj = None
+
+        # simplejpeg (Cython sur libjpeg-turbo, wheels autonomes) en alternative à PyTurboJPEG
+        if _tj is None and encoder_pref in ('auto', 'nvjpeg', 'simplejpeg'):
+            try:
+                import simplejpeg as _sj
+                if _nvj is None:
+                    logger.info("Encodage JPEG: backend libjpeg-turbo (simplejpeg)")
+            except Exception:
+                _sj = None
+
+        _backends_ready = True
+
+
+@lru_cache(maxsize=8)
+def _cv2_params(quality):
+    """Paramètres cv2.imencode construits une fois par qualité: pas de 2e passe Huffman (OPTIMIZE) ni de progressif"""
+    return [int(cv2.IMWRITE_JPEG_QUALITY), int(quality), int(cv2.IMWRITE_JPEG_OPTIMIZE), 0, int(cv2.IMWRITE_JPEG_PROGRESSIVE), 0]
+
+
+def encode_jpeg(frame, quality: int = 85):
+    """Encode une frame BGR en JPEG et retourne les bytes (None en cas d'échec).
+    Ordre de préférence: nvJPEG (GPU), PyTurboJPEG, simplejpeg, puis cv2.imencode.
+    """
+    if frame is None:
+        return None
+    if not _backends_ready:
+        _init_backends()
+    if _nvj is not None:
+        try:
+            return _nvj.encode(frame, quality)
+        except Exception as e:
+            logger.debug(f"Encodage nvJPEG échoué, fallback CPU: {e}")
+    if _tj is not None:
+        try:
+            return _tj.encode(frame, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+        except Exception as e:
+            logger.debug(f"Encodage TurboJPEG échoué, fallback OpenCV: {e}")
+    if _sj is not None:
+        try:
+            return _sj.encode_jpeg(np.ascontiguousarray(frame), quality=quality, colorspace='BGR', fastdct=True)
+        except Exception as e:
+            logger.debug(f"Encodage simplejpeg échoué, fallback OpenCV: {e}")
+    success, buffer = cv2.imencode('.jpg', frame, _cv2_params(quality))
+    if not success:
+        return None
+    return buffer.tobytes()
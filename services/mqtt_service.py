@@ -3,9 +3,26 @@ import json
 import paho.mqtt.client as mqtt
 import time
 import sys
+import threading
 import atexit
 from typing import Dict, Any
 
+# Sérialisation JSON rapide (orjson, retourne des bytes acceptés par paho) si disponible
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj):
+    """Sérialise en JSON via orjson si possible, sinon json.dumps (types non supportés inclus)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
 # Variable globale pour stocker l'instance unique du service MQTT
 _mqtt_instance = None
 
@@ -71,6 +88,8 @@ class MQTTService:
         self.client_id = f"iaction_client_{self.device_id}_{pid}"
         self.client = None
         self.is_connected = False
+        # Signalé par _on_connect: permet d'attendre la connexion sans boucle de polling
+        self._connected_event = threading.Event()
         self.published_sensors = set()
         self.message_buffer = {}
         self.last_publish_time = 0
@@ -128,6 +147,7 @@ class MQTTService:
         self.client_id = f"iaction_client_{self.device_id}_{pid}"
         self.client = None
         self.is_connected = False
+        self._connected_event.clear()
 
         # Reconnecter avec la nouvelle configuration
         return self.connect()
@@ -187,11 +207,17 @@ class MQTTService:
                 print(f"Erreur lors de la déconnexion MQTT: {e}")
             finally:
                 self.is_connected = False
+                self._connected_event.clear()
+
+    def wait_until_connected(self, timeout: float = 3.0) -> bool:
+        """Attend (au plus timeout secondes) que la connexion au broker soit établie"""
+        return self._connected_event.wait(timeout)
     
     def _on_connect(self, client, userdata, flags, rc):
         """Callback de connexion"""
         if rc == 0:
             self.is_connected = True
+            self._connected_event.set()
             print("✅ MQTT: Connecté avec succès")
             
             # Vérifier si c'est une reconnexion ou une première connexion
@@ -226,6 +252,7 @@ class MQTTService:
     def _on_disconnect(self, client, userdata, rc):
         """Callback de déconnexion"""
         self.is_connected = False
+        self._connected_event.clear()
         # rc == 0 -> déconnexion propre ; sinon déconnexion inattendue
         if getattr(self, '_manual_disconnect', False) or rc == 0:
             print("Déconnexion propre du broker MQTT")
@@ -312,7 +339,7 @@ class MQTTService:
             config_payload["unit_of_measurement"] = unit_of_measurement
         
         try:
-            self.client.publish(config_topic, json.dumps(config_payload), retain=True)
+            self.client.publish(config_topic, _json_dumps(config_payload), retain=True)
             self.published_sensors.add(sensor_id)
             print(f"Capteur configuré: {name}")
             return True
@@ -339,7 +366,7 @@ class MQTTService:
         }
         
         try:
-            self.client.publish(config_topic, json.dumps(config_payload), retain=True)
+            self.client.publish(config_topic, _json_dumps(config_payload), retain=True)
             self.published_sensors.add(sensor_id)
             print(f"Binary sensor configuré: {name}")
             return True
@@ -474,7 +501,7 @@ class MQTTService:
             else:
                 # Topic global
                 status_topic = f"{self.topic_prefix}/status"
-            status_json = json.dumps(status_data)
+            status_json = _json_dumps(status_data)
             self.client.publish(status_topic, status_json)
             return True
         except Exception as e:
@@ -715,6 +715,7 @@ class IActionApp {
         offline: "Hors ligne",
         error: "Erreur de connexion",
         not_configured: "Non configurée",
+        pending: "Test en cours",
       };
       infoMessage.push(
         `Statut: ${statusText[camera.test_status] || "Inconnu"}`
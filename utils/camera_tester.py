@@ -87,7 +87,8 @@ def interactive_camera_selection():
                 'online': '🟢',
                 'offline': '🔴',
                 'error': '🟡',
-                'not_configured': '⚪'
+                'not_configured': '⚪',
+                'pending': '⏳'
             }
             status = f" {status_icons.get(camera['test_status'], '❓')}"
         